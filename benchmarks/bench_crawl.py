@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Crawl plan benchmark
+Serves synthetic sites locally whose contacts sit where real ones tend to
+(mostly /contact-us and /contact, some on the homepage or a linked page, some
+split over two pages, some nowhere) and crawls a test set of them with
+  - fixed:   the profile's declared path order, nothing learned,
+  - in-run:  PATH_STATS learning from the test sites as they are crawled,
+  - learned: PATH_STATS loaded from a SQLite file trained on other sites,
+reporting requests per site and recall: of the emails, of the phones, and of
+sites where both were found.
+
+Usage: python3 benchmarks/bench_crawl.py [-n 200] [--train 300] [--json OUT]
+"""
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper_v3  # noqa: E402
+from scraper_v3 import FETCH_STATS, ContactScraper, PathStats  # noqa: E402
+
+# Where a site's email and phone are, and how often
+LAYOUT = [
+    (("/contact-us", "/contact-us"), 0.35),
+    (("/contact", "/contact"), 0.15),
+    (("", ""), 0.08),  # homepage footer
+    (("/info/contact-details", "/info/contact-details"), 0.08),  # only linked from the homepage
+    (("/contact-us", ""), 0.10),  # email on the contact page, phone in the homepage footer
+    (("/contact", "/about"), 0.09),  # phone only on the linked about page
+    ((None, None), 0.15),  # no contacts anywhere
+]
+EMAIL = "<p>Email: office@site{n}.edu.np</p>"
+PHONE = "<footer>Phone: 01-4{n:06d}</footer>"
+
+
+def site_layout(n: int) -> tuple:
+    """(email page, phone page) of site n; None where it has none."""
+    rng = random.Random(n)
+    pick = rng.random()
+    for pages, share in LAYOUT:
+        if pick < share:
+            return pages
+        pick -= share
+    return None, None
+
+
+def serve() -> str:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            site, _, path = self.path.lstrip("/").partition("/")
+            path = "/" + path if path else ""
+            n = int(site[4:])
+            pages = site_layout(n)
+            if path == "":
+                body = f'<a href="{base}/{site}/about">About us</a>'
+                if "/info/contact-details" in pages:
+                    body += f'<a href="{base}/{site}/info/contact-details">Contact</a>'
+            elif path == "/about":
+                body = "<p>Established in 1990.</p>"
+            elif path in pages:
+                body = ""
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if path == pages[0]:
+                body += EMAIL.format(n=n)
+            if path == pages[1]:
+                body += PHONE.format(n=n)
+            data = f"<html><body>{body}</body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return base
+
+
+def crawl(base: str, sites: List[int], fixed: bool = False) -> Dict:
+    before = FETCH_STATS.requests
+    found = {"email": 0, "phone": 0, "site": 0}
+    expected = {"email": 0, "phone": 0, "site": 0}
+    for n in sites:
+        if fixed:
+            scraper_v3.PATH_STATS = PathStats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = ContactScraper(f"{base}/site{n}").run()
+        email_page, phone_page = site_layout(n)
+        email = f"office@site{n}.edu.np" in result["emails"]
+        phone = result["numbers"] != "Not found"
+        if email_page is not None:
+            expected["email"] += 1
+            found["email"] += email
+        if phone_page is not None:
+            expected["phone"] += 1
+            found["phone"] += phone
+        if email_page is not None and phone_page is not None:
+            expected["site"] += 1
+            found["site"] += email and phone
+    requests = FETCH_STATS.requests - before
+    report = {"sites": len(sites), "requests_per_site": requests / len(sites)}
+    for kind in found:
+        report[f"{kind}_recall"] = found[kind] / expected[kind] if expected[kind] else 1.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark learned crawl plans")
+    parser.add_argument("-n", "--sites", type=int, default=200, help="Test sites (default: 200)")
+    parser.add_argument("--train", type=int, default=300, help="Training sites (default: 300)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    scraper_v3.log_info = scraper_v3.log_error = scraper_v3.log_debug = lambda msg: None
+    scraper_v3.ROBOTS.enabled = False  # one origin for all sites; see bench_robots.py
+    base = serve()
+    test = list(range(args.sites))
+    train = list(range(args.sites, args.sites + args.train))
+
+    report = {"fixed": crawl(base, test, fixed=True)}
+    scraper_v3.PATH_STATS = PathStats()
+    report["in-run"] = crawl(base, test)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "path_stats.sqlite")
+        scraper_v3.PATH_STATS = PathStats()
+        scraper_v3.PATH_STATS.open(db)
+        crawl(base, train)
+        scraper_v3.PATH_STATS.close()
+        scraper_v3.PATH_STATS = PathStats()
+        scraper_v3.PATH_STATS.open(db)  # a later run
+        report["learned"] = crawl(base, test)
+        scraper_v3.PATH_STATS.close()
+
+    print(f"{args.sites} test sites, {args.train} training sites\n")
+    print(f"{'plan':<10} {'requests/site':>14} {'emails':>8} {'phones':>8} {'sites':>8}")
+    for plan, r in report.items():
+        print(
+            f"{plan:<10} {r['requests_per_site']:>14.2f} {r['email_recall']:>8.1%} "
+            f"{r['phone_recall']:>8.1%} {r['site_recall']:>8.1%}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Per-site memory benchmark
+Keeps N ContactScraper instances alive at once (as in a large batch where they
+are all in flight), feeds each a synthetic homepage offline and reports how
+resident memory grows with the number of sites. With release() the retained
+state per site is a few KB, so RSS stays flat; --keep-bodies shows the cost of
+holding every page body and link list until the end.
+
+Usage: python3 benchmarks/bench_memory.py [-n 500] [--page-kb 120] [--keep-bodies] [--trace] [--json OUT]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import resource
+import sys
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_v3 import ContactScraper  # noqa: E402
+
+CHECKPOINTS = (1, 50, 100, 250, 500, 1000)
+
+
+def make_page(i: int, page_kb: int) -> str:
+    """A homepage with contacts, a few hundred same-site links and filler text."""
+    links = "".join(
+        f'<li><a href="https://site{i}.com.np/news/{i}-{n}">News {n}</a></li>' for n in range(400)
+    )
+    footer = (
+        f"<footer><p>Phone: 01-4{i % 1000:03d}123, +977 98{i % 100:02d}123456</p>"
+        f'<p>Email: <a href="mailto:info@site{i}.com.np">info@site{i}.com.np</a></p></footer>'
+    )
+    filler = f"<p>Site {i} has served students since 1990 with a broad programme. </p>"
+    body = f"<html><body><nav><ul>{links}</ul></nav>{footer}"
+    repeat = max(0, page_kb * 1024 - len(body)) // len(filler) + 1
+    return body + filler * repeat + "</body></html>"
+
+
+def scrape_offline(scraper: ContactScraper, html: str, keep_bodies: bool) -> Dict:
+    """The network-free part of ContactScraper.run() over one homepage."""
+    scraper.content = html
+    scraper.scrape_structured()
+    scraper.handle_hyperlinks(scraper.extract_from_text(scraper.content))
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = scraper._result()
+    if not keep_bodies:
+        scraper.release()
+    return result
+
+
+def rss_mb() -> float:
+    """Current resident set size (falls back to the peak where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run(sites: int, page_kb: int, keep_bodies: bool, trace: bool = False) -> List[Dict]:
+    checkpoints = sorted({c for c in CHECKPOINTS if c <= sites} | {sites})
+    alive = []
+    rows = []
+    # warm up caches and the allocator so the baseline isn't charged to site 1
+    scrape_offline(ContactScraper("https://warmup.com.np"), make_page(0, page_kb), False)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    base_traced = tracemalloc.get_traced_memory()[0]
+    base_rss = rss_mb()
+    for i in range(1, sites + 1):
+        scraper = ContactScraper(f"https://site{i}.com.np")
+        scrape_offline(scraper, make_page(i, page_kb), keep_bodies)
+        alive.append(scraper)
+        if i in checkpoints:
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] - base_traced
+            rows.append(
+                {
+                    "sites": i,
+                    "rss_mb": rss_mb() - base_rss,
+                    "traced_mb": traced / 2**20 if trace else None,
+                    "kb_per_site": traced / i / 1024 if trace else None,
+                }
+            )
+    if trace:
+        tracemalloc.stop()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-site scraper memory")
+    parser.add_argument("-n", "--sites", type=int, default=500, help="Sites alive at once (default: 500)")
+    parser.add_argument("--page-kb", type=int, default=120, help="Homepage size in KB (default: 120)")
+    parser.add_argument(
+        "--keep-bodies", action="store_true", help="Don't release() page bodies and links"
+    )
+    parser.add_argument(
+        "--trace", action="store_true", help="Also count Python allocations (slow)"
+    )
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    rows = run(args.sites, args.page_kb, args.keep_bodies, args.trace)
+    mode = "keep bodies" if args.keep_bodies else "released"
+    print(f"{args.sites} sites, {args.page_kb} KB pages ({mode})\n")
+    print(f"{'sites':>6} {'RSS +MB':>9} {'traced MB':>10} {'KB/site':>9}")
+    for r in rows:
+        traced = f"{r['traced_mb']:>10.1f} {r['kb_per_site']:>9.1f}" if args.trace else f"{'-':>10} {'-':>9}"
+        print(f"{r['sites']:>6} {r['rss_mb']:>9.1f} {traced}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"mode": mode, "page_kb": args.page_kb, "rows": rows}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
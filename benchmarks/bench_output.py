@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Output format benchmark
+Writes N synthetic result rows with each sink and reports write time and file
+size against the original format (indented JSON + CSV with list reprs).
+
+Usage: python3 benchmarks/bench_output.py [-n 100000] [--provenance] [--json OUT]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_v3 import open_sink, write_csv  # noqa: E402
+
+
+def make_rows(n: int, provenance: bool) -> List[Dict]:
+    rows = []
+    for i in range(n):
+        site = f"https://school{i}.edu.np"
+        emails = [f"info@school{i}.edu.np", f"admission{i % 7}@school{i}.edu.np"][: 1 + i % 2]
+        numbers = [f"01{4000000 + i % 999999:07d}", f"98{i % 100000000:08d}"][: 1 + i % 2]
+        row = {"website": site, "emails": emails if i % 10 else "Not found", "numbers": numbers}
+        if provenance:
+            row["sources"] = {
+                "emails": {e: f"{site}/contact" for e in emails},
+                "phones": {p: site for p in numbers},
+            }
+        rows.append(row)
+    return rows
+
+
+def legacy_json(rows: List[Dict], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+def legacy_csv(rows: List[Dict], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        w = csv.DictWriter(f, rows[0].keys())
+        w.writeheader()
+        for row in rows:
+            w.writerow(row)
+
+
+def sink_writer(rows: List[Dict], path: str):
+    sink = open_sink(path)
+    try:
+        for row in rows:
+            sink.write(row)
+    finally:
+        sink.close()
+
+
+FORMATS: Dict[str, Callable] = {
+    "json (indented, legacy)": legacy_json,
+    "csv (list reprs, legacy)": legacy_csv,
+    "csv (joined lists)": write_csv,
+    "jsonl": sink_writer,
+    "jsonl.gz": sink_writer,
+    "parquet": sink_writer,
+}
+EXTENSIONS = {
+    "json (indented, legacy)": ".json",
+    "csv (list reprs, legacy)": ".csv",
+    "csv (joined lists)": ".csv",
+    "jsonl": ".jsonl",
+    "jsonl.gz": ".jsonl.gz",
+    "parquet": ".parquet",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark result output formats")
+    parser.add_argument("-n", "--rows", type=int, default=100000, help="Rows written (default: 100000)")
+    parser.add_argument("--provenance", action="store_true", help="Include per-value sources")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.provenance)
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, writer in FORMATS.items():
+            path = os.path.join(tmp, "out" + EXTENSIONS[name])
+            start = time.perf_counter()
+            try:
+                writer(rows, path)
+            except RuntimeError as e:  # optional dependency missing
+                report[name] = {"error": str(e)}
+                continue
+            elapsed = time.perf_counter() - start
+            report[name] = {
+                "seconds": elapsed,
+                "rows_per_sec": len(rows) / elapsed if elapsed else 0.0,
+                "mb": os.path.getsize(path) / 2**20,
+            }
+
+    base = report["json (indented, legacy)"]["mb"]
+    print(f"{len(rows)} rows{' with provenance' if args.provenance else ''}\n")
+    print(f"{'format':<26} {'rows/s':>12} {'MB':>9} {'vs json':>8}")
+    for name, r in report.items():
+        if "error" in r:
+            print(f"{name:<26} skipped: {r['error']}")
+            continue
+        print(f"{name:<26} {r['rows_per_sec']:>12,.0f} {r['mb']:>9.2f} {r['mb'] / base:>7.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
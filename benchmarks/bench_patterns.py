@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Extraction micro-benchmarks
+Measures throughput of the phone/email patterns and precision/recall of the
+extraction layer against the golden corpus in extraction_corpus.json.
+
+Usage: python3 benchmarks/bench_patterns.py [-r ROUNDS] [--json OUT] [--fail-under 0.9]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_v3 import ContactScraper, Patterns, normalize_phone  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_corpus.json")
+PATTERN_NAMES = [
+    "EMAIL",
+    "EMAIL_STRICT",
+    "PHONE_NP",
+    "NEW_PHONE_NP",
+    "NEW_NEW_PHONE_NP",
+    "OTHER_PHONE_NP",
+]
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def extract_case(html: str) -> Tuple[Set[str], Set[str]]:
+    """Run the offline part of ContactScraper.run() over a single page."""
+    scraper = ContactScraper("https://corpus.local")
+    scraper.extract_from_text(html)
+    scraper.clean_emails()
+    return set(scraper.emails), set(scraper.phones)
+
+
+def score(cases: List[Dict]) -> Dict:
+    totals = {
+        "emails": {"tp": 0, "fp": 0, "fn": 0},
+        "phones": {"tp": 0, "fp": 0, "fn": 0},
+    }
+    failures = []
+    for case in cases:
+        got_emails, got_phones = extract_case(case["html"])
+        for field, got in (("emails", got_emails), ("phones", got_phones)):
+            expected = set(case[field])
+            totals[field]["tp"] += len(got & expected)
+            totals[field]["fp"] += len(got - expected)
+            totals[field]["fn"] += len(expected - got)
+            if got != expected:
+                failures.append(
+                    {
+                        "id": case["id"],
+                        "field": field,
+                        "missing": sorted(expected - got),
+                        "unexpected": sorted(got - expected),
+                    }
+                )
+    report = {}
+    for field, t in totals.items():
+        found = t["tp"] + t["fp"]
+        relevant = t["tp"] + t["fn"]
+        report[field] = {
+            "precision": t["tp"] / found if found else 1.0,
+            "recall": t["tp"] / relevant if relevant else 1.0,
+            **t,
+        }
+    report["failures"] = failures
+    return report
+
+
+def bench_patterns(cases: List[Dict], rounds: int) -> Dict:
+    text = "\n".join(case["html"] for case in cases) * 50
+    results = {}
+    for name in PATTERN_NAMES:
+        pattern = getattr(Patterns, name)
+        matches = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            matches += sum(1 for _ in pattern.finditer(text))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "matches": matches,
+            "seconds": elapsed,
+            "matches_per_sec": matches / elapsed if elapsed else 0.0,
+            "mb_per_sec": len(text) * rounds / elapsed / 1e6 if elapsed else 0.0,
+        }
+    return results
+
+
+def bench_normalize(cases: List[Dict], rounds: int) -> Dict:
+    raw = []
+    for name in PATTERN_NAMES[2:]:
+        pattern = getattr(Patterns, name)
+        for case in cases:
+            raw.extend(m.group() for m in pattern.finditer(case["html"]))
+    raw = raw * 100
+    results = {}
+    # __wrapped__ bypasses the LRU memo so the scanner itself is measured too
+    uncached = getattr(normalize_phone, "__wrapped__", normalize_phone)
+    for label, func in (("cached", normalize_phone), ("uncached", uncached)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for phone in raw:
+                func(phone)
+        elapsed = time.perf_counter() - start
+        calls = len(raw) * rounds
+        results[label] = {
+            "calls": calls,
+            "seconds": elapsed,
+            "calls_per_sec": calls / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def bench_extraction(cases: List[Dict], rounds: int) -> Dict:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for case in cases:
+            extract_case(case["html"])
+    elapsed = time.perf_counter() - start
+    pages = len(cases) * rounds
+    return {"pages": pages, "seconds": elapsed, "pages_per_sec": pages / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contact extraction patterns")
+    parser.add_argument("-r", "--rounds", type=int, default=20, help="Timing rounds (default: 20)")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Path to the golden corpus")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument(
+        "--fail-under",
+        type=float,
+        default=None,
+        help="Exit non-zero if any precision/recall drops below this value",
+    )
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    report = {
+        "accuracy": score(cases),
+        "patterns": bench_patterns(cases, args.rounds),
+        "normalize_phone": bench_normalize(cases, args.rounds),
+        "extraction": bench_extraction(cases, args.rounds),
+    }
+
+    print(f"Corpus: {len(cases)} cases\n")
+    print(f"{'field':<8} {'precision':>10} {'recall':>8} {'tp':>4} {'fp':>4} {'fn':>4}")
+    for field in ("emails", "phones"):
+        a = report["accuracy"][field]
+        print(
+            f"{field:<8} {a['precision']:>10.3f} {a['recall']:>8.3f} "
+            f"{a['tp']:>4} {a['fp']:>4} {a['fn']:>4}"
+        )
+    print()
+    print(f"{'pattern':<18} {'matches/s':>12} {'MB/s':>8}")
+    for name, p in report["patterns"].items():
+        print(f"{name:<18} {p['matches_per_sec']:>12,.0f} {p['mb_per_sec']:>8.2f}")
+    print()
+    for label, n in report["normalize_phone"].items():
+        print(f"normalize_phone ({label}): {n['calls_per_sec']:,.0f} calls/s")
+    print(f"extraction: {report['extraction']['pages_per_sec']:,.0f} pages/s")
+
+    failures = report["accuracy"]["failures"]
+    if failures:
+        print(f"\n{len(failures)} mismatches:")
+        for f in failures:
+            print(f"  {f['id']:<28} {f['field']:<7} missing={f['missing']} unexpected={f['unexpected']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.fail_under is not None:
+        for field in ("emails", "phones"):
+            a = report["accuracy"][field]
+            if a["precision"] < args.fail_under or a["recall"] < args.fail_under:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
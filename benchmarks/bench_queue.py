@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Work queue benchmark
+Runs the SQLite work queue on a local file and checks the lease cycle:
+  - a worker that stops renewing loses its sites once the lease expires, and
+    another worker gets them; the first worker can no longer fail them,
+  - a site whose leases keep expiring is marked failed after MAX_ATTEMPTS,
+  - a second run on the same file scrapes its sites again and only returns
+    its own results,
+then measures sites per second with several workers leasing at once.
+Exits non-zero when a check fails.
+
+Usage: python3 benchmarks/bench_queue.py [-n 2000] [--workers 8] [--json OUT]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from work_queue import WorkQueue  # noqa: E402
+
+LEASE = 0.5  # seconds; short so the checks don't wait long
+
+
+def check_leases(db: str) -> List[str]:
+    failed = []
+
+    def check(name: str, ok: bool):
+        print(f"{'ok' if ok else 'FAIL':<5} {name}")
+        if not ok:
+            failed.append(name)
+
+    queue = WorkQueue(db, lease_seconds=LEASE, max_attempts=2)
+    mode = queue.conn.execute("PRAGMA journal_mode").fetchone()[0]
+    check("rollback journal, not WAL", mode == "delete")
+
+    urls = [f"https://school{i}.edu.np" for i in range(3)]
+    check("enqueue adds every site", queue.enqueue(urls, "run-1") == 3)
+    check("enqueue again adds nothing", queue.enqueue(urls, "run-1") == 0)
+
+    held = queue.lease("dead", 2)
+    check("lease hands out pending sites", [url for _, url in held] == urls[:2])
+    live = queue.lease("live", 3)
+    check("leased sites aren't handed out twice", [url for _, url in live] == urls[2:])
+    check("nothing left while leases are live", queue.lease("live", 3) == [])
+
+    time.sleep(LEASE * 0.6)
+    queue.renew([site for site, _ in live], "live")
+    time.sleep(LEASE * 0.6)
+    taken = queue.lease("live", 3)
+    check("expired leases go to another worker", taken == held)
+    queue.fail(held[0][0], "dead", "late error")
+    check("the old holder can't fail a reassigned site", queue.stats("run-1")["leased"] == 3)
+    queue.complete(held[0][0], "live", {"website": urls[0]})
+
+    time.sleep(LEASE * 1.2)
+    queue.lease("live", 3)  # held[1] is out of attempts, urls[2] gets its second lease
+    check("a site out of attempts is failed", queue.stats("run-1")["failed"] == 1)
+    time.sleep(LEASE * 1.2)
+    queue.lease("live", 3)
+    counts = queue.stats("run-1")
+    check("every site ends done or failed", counts == {"pending": 0, "leased": 0, "done": 1, "failed": 2})
+    check("the run is finished", queue.finished("run-1"))
+
+    check("a new run queues the same sites again", queue.enqueue(urls, "run-2") == 3)
+    for site, url in queue.lease("live", 3):
+        queue.complete(site, "live", {"website": url, "run": 2})
+    check("results only hold the run's rows", [r.get("run") for r in queue.results("run-2")] == [2, 2, 2])
+    check("failures only hold the run's rows", queue.failures("run-2") == [])
+    queue.close()
+    return failed
+
+
+def throughput(db: str, sites: int, workers: int) -> Dict:
+    queue = WorkQueue(db)
+    queue.enqueue((f"https://site{i}.com.np" for i in range(sites)), "bench")
+    queue.close()
+    done = []
+
+    def work(name: str):
+        own = WorkQueue(db)  # one connection per worker, like separate nodes
+        count = 0
+        while True:
+            leased = own.lease(name, 4)
+            if not leased:
+                break
+            for site, url in leased:
+                own.complete(site, name, {"website": url})
+                count += 1
+        own.close()
+        done.append(count)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=work, args=(f"w{i}",)) for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    queue = WorkQueue(db)
+    results = len(queue.results("bench"))
+    queue.close()
+    return {
+        "sites": sites,
+        "workers": workers,
+        "seconds": elapsed,
+        "sites_per_sec": sites / elapsed if elapsed else 0.0,
+        "completed": sum(done),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the work queue")
+    parser.add_argument("-n", "--sites", type=int, default=2000, help="Sites to queue (default: 2000)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent workers (default: 8)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failed = check_leases(os.path.join(tmp, "leases.sqlite"))
+        report = throughput(os.path.join(tmp, "bench.sqlite"), args.sites, args.workers)
+
+    if report["completed"] != args.sites or report["results"] != args.sites:
+        failed.append("every site completed exactly once")
+    print(
+        f"\n{report['sites']} sites, {report['workers']} workers: {report['sites_per_sec']:.0f} sites/s, "
+        f"{report['completed']} completed, {report['results']} results"
+    )
+    report["failed_checks"] = failed
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if failed:
+        print(f"\n{len(failed)} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+robots.txt overhead benchmark
+Crawls N local sites (one origin each, so each has its own robots.txt that
+disallows a few of the profile's paths) with robots.txt ignored, read cold,
+and read from the SQLite cache of an earlier run, and reports requests per
+site, disallowed URLs skipped and wall time.
+
+Usage: python3 benchmarks/bench_robots.py [-n 50] [--json OUT]
+"""
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper_v3  # noqa: E402
+from scraper_v3 import FETCH_STATS, ContactScraper, PathStats, RobotsPolicy  # noqa: E402
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /college\nDisallow: /school\nDisallow: /hss\n"
+PAGES = {
+    "/robots.txt": ROBOTS_TXT,
+    "": '<a href="/about">About us</a>',
+    "/about": "<p>Established in 1990.</p>",
+    "/reach-us": "<footer>Phone: 01-4261234 Email: office@school.edu.np</footer>",
+}
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = PAGES.get(self.path.rstrip("/"))
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(n: int) -> List[str]:
+    sites = []
+    for _ in range(n):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        sites.append(f"http://127.0.0.1:{server.server_address[1]}")
+    return sites
+
+
+def crawl(sites: List[str], robots: RobotsPolicy) -> Dict:
+    scraper_v3.ROBOTS = robots
+    scraper_v3.PATH_STATS = PathStats()  # same (declared) path order in every mode
+    before = FETCH_STATS.requests
+    start = time.perf_counter()
+    for site in sites:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ContactScraper(site).run()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_site": (FETCH_STATS.requests - before) / len(sites),
+        "skipped": robots.blocked,
+        "seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark robots.txt overhead")
+    parser.add_argument("-n", "--sites", type=int, default=50, help="Sites (default: 50)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    scraper_v3.log_info = scraper_v3.log_error = scraper_v3.log_debug = lambda msg: None
+    sites = serve(args.sites)
+    ignored = RobotsPolicy()
+    ignored.enabled = False
+    report = {"ignored": crawl(sites, ignored)}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "cache.sqlite")
+        for mode in ("cold", "cached"):
+            robots = RobotsPolicy()
+            robots.open(db)
+            report[mode] = crawl(sites, robots)
+            robots.close()
+
+    print(f"{args.sites} sites\n")
+    print(f"{'robots.txt':<10} {'requests/site':>14} {'skipped':>8} {'seconds':>8}")
+    for mode, r in report.items():
+        print(f"{mode:<10} {r['requests_per_site']:>14.2f} {r['skipped']:>8} {r['seconds']:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
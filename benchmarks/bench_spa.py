@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+SPA classifier benchmark
+Compares the pre-scoring React/Vue detection with classify_spa on a labeled
+corpus: render rate, misclassifications, classification speed and the
+Selenium time saved by avoided renders.
+
+Usage: python3 benchmarks/bench_spa.py [-r ROUNDS] [--render-cost SECONDS]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_v3 import classify_spa  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "spa_corpus.json")
+FILLER = " ".join(
+    "Our campus offers undergraduate and graduate programs with experienced faculty".split()
+    * 30
+)
+
+# Detection as it was before classify_spa, kept here as the baseline
+LEGACY_REACT_INDICATORS = [
+    'id="root"',
+    "id='root'",
+    "[data-reactroot]",
+    "[data-reactid]",
+    "[data-react-root]",
+    "react",
+]
+LEGACY_VUE_CHECKS = [
+    r"__vue__",
+    r"data-v-",
+    r"_v-",
+    r"vue\.min\.js",
+    r"vue\.global\.prod\.js",
+    r"__vue_app__",
+    r"__VUE__",
+    r"@vue/runtime-core",
+    r"runtime-dom",
+    r"Vue\.config",
+    r"vue-devtools",
+    r'id="app"',
+]
+
+
+def legacy_needs_render(html: str) -> bool:
+    is_vue = any(re.search(p, html, re.IGNORECASE) for p in LEGACY_VUE_CHECKS)
+    is_react = any(ind in html for ind in LEGACY_REACT_INDICATORS)
+    return is_vue or is_react
+
+
+def scored_needs_render(html: str) -> bool:
+    return classify_spa(html)[0] is not None
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    for case in cases:
+        case["html"] = case["html"].replace("{{filler}}", FILLER)
+    return cases
+
+
+def evaluate(detector: Callable[[str], bool], cases: List[Dict], rounds: int) -> Dict:
+    renders, fp, fn = 0, [], []
+    for case in cases:
+        render = detector(case["html"])
+        renders += render
+        if render and not case["render"]:
+            fp.append(case["id"])
+        elif not render and case["render"]:
+            fn.append(case["id"])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for case in cases:
+            detector(case["html"])
+    elapsed = time.perf_counter() - start
+    return {
+        "renders": renders,
+        "render_rate": renders / len(cases),
+        "false_positives": fp,
+        "false_negatives": fn,
+        "pages_per_sec": len(cases) * rounds / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SPA render decisions")
+    parser.add_argument("-r", "--rounds", type=int, default=200, help="Timing rounds (default: 200)")
+    parser.add_argument(
+        "--render-cost",
+        type=float,
+        default=8.0,
+        help="Seconds per Selenium render: launch + 5s wait (default: 8)",
+    )
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Path to the labeled corpus")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    needed = sum(case["render"] for case in cases)
+    print(f"Corpus: {len(cases)} pages, {needed} need rendering\n")
+    report = {}
+    for name, detector in (("legacy", legacy_needs_render), ("scored", scored_needs_render)):
+        r = report[name] = evaluate(detector, cases, args.rounds)
+        print(
+            f"{name:<7} render rate {r['render_rate']:.0%} ({r['renders']}/{len(cases)})  "
+            f"{r['pages_per_sec']:,.0f} pages/s"
+        )
+        print(f"        false positives: {r['false_positives']}")
+        print(f"        false negatives: {r['false_negatives']}")
+    saved = report["legacy"]["renders"] - report["scored"]["renders"]
+    print(
+        f"\nAvoided renders: {saved} → ~{saved * args.render_cost:.0f}s of Selenium saved "
+        f"({saved / len(cases) * args.render_cost:.1f}s per site)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+Times fresh interpreters importing scraper_v3, printing `--help` and running
+an offline static extraction, and lists which heavy dependencies each of them
+ended up loading (selenium should only appear once something renders).
+
+Usage: python3 benchmarks/bench_startup.py [-r ROUNDS] [--json OUT]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["selenium", "bs4", "requests", "urllib3", "pdb"]
+
+REPORT_MODULES = (
+    "import sys; print(','.join(m for m in {heavy!r} if m in sys.modules), file=sys.stderr)"
+)
+CASES = {
+    "import": "import scraper_v3",
+    "help": "import sys, scraper_v3; sys.argv = ['scraper_v3.py', '--help']\n"
+    "try:\n    scraper_v3.main()\nexcept SystemExit:\n    pass",
+    "static-extract": "import scraper_v3\n"
+    "scraper_v3.extract_contacts('<p>Phone: 01-4261234</p>', 'https://example.com.np')",
+    "render-options": "import scraper_v3; scraper_v3.firefox_options()",
+}
+
+
+def time_case(code: str, rounds: int) -> Dict:
+    script = code + "\n" + REPORT_MODULES.format(heavy=HEAVY)
+    timings: List[float] = []
+    loaded = ""
+    for _ in range(rounds):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+        loaded = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "loaded": [m for m in loaded.split(",") if m],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraper_v3 startup time")
+    parser.add_argument("-r", "--rounds", type=int, default=10, help="Runs per case (default: 10)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    baseline = time_case("pass", args.rounds)
+    report = {"interpreter": baseline}
+    report.update({name: time_case(code, args.rounds) for name, code in CASES.items()})
+
+    print(f"{'case':<16} {'median ms':>10} {'min ms':>8}  loaded")
+    for name, r in report.items():
+        print(f"{name:<16} {r['median_ms']:>10.1f} {r['min_ms']:>8.1f}  {', '.join(r['loaded']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Fetch transport benchmark
+Fetches every site's homepage plus EDU_PATHS (the pages a crawl touches) with
+  - per-request: a fresh requests.get() per page, as the scraper used to,
+  - session:     ContactScraper's per-site connection pool (HTTP/1.1),
+  - http2:       ContactScraper over httpx HTTP/2 (needs httpx[http2]),
+and reports wall time and body bytes on the wire. Without -f it runs against a
+local gzip-capable HTTP/1.1 server that charges a handshake delay per new
+connection (HTTP/2 needs TLS, so real sites are needed to measure it).
+
+Usage: python3 benchmarks/bench_transport.py [-f urls.txt] [--handshake-ms 40] [--json OUT]
+"""
+import argparse
+import gzip
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper_v3  # noqa: E402
+from scraper_v3 import EDU_PATHS, FETCH_STATS, HEADERS, ContactScraper, requests  # noqa: E402
+
+PAGE = (
+    "<html><body><nav>" + "".join(f'<a href="/news/{n}">News {n}</a>' for n in range(200)) + "</nav>"
+    + "<p>Established in 1990, the school offers science and management programmes.</p>" * 400
+    + "<footer>Phone: 01-4261234 Email: info@school.edu.np</footer></body></html>"
+).encode()
+
+
+def serve(handshake: float) -> str:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like real sites
+        disable_nagle_algorithm = True  # else delayed ACKs add ~40ms to every reused request
+
+        def setup(self):
+            time.sleep(handshake)  # TCP + TLS setup of a new connection
+            super().setup()
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = PAGE
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def per_request(site: str) -> int:
+    fetched = 0
+    for path in [""] + EDU_PATHS:
+        try:
+            res = requests.get(site + path, headers=HEADERS, timeout=5, verify=False, stream=True)
+            with res:
+                res.content
+                FETCH_STATS.add_bytes(res.raw.tell())
+            fetched += 1
+        except requests.RequestException:
+            pass
+    return fetched
+
+
+def with_scraper(site: str, transport: str) -> int:
+    scraper = ContactScraper(site, transport=transport)
+    fetched = 0
+    try:
+        for path in [""] + EDU_PATHS:
+            try:
+                scraper._request(site + path)
+                fetched += 1
+            except requests.RequestException:
+                pass
+    finally:
+        scraper.release()
+    return fetched
+
+
+def run(sites: List[str], mode: str) -> Dict:
+    transport = "http2" if mode == "http2" else "requests"
+    before = FETCH_STATS.bytes
+    start = time.perf_counter()
+    if mode == "per-request":
+        pages = sum(per_request(site) for site in sites)
+    else:
+        pages = sum(with_scraper(site, transport) for site in sites)
+    elapsed = time.perf_counter() - start
+    return {
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "mb": (FETCH_STATS.bytes - before) / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetch transports")
+    parser.add_argument("-f", "--file", help="Real sites to fetch, one URL per line")
+    parser.add_argument("-n", "--sites", type=int, default=20, help="Local sites (default: 20)")
+    parser.add_argument(
+        "--handshake-ms", type=float, default=40, help="Local connection setup delay (default: 40)"
+    )
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            sites = [line.strip().rstrip("/") for line in f if line.strip()]
+    else:
+        base = serve(args.handshake_ms / 1000)
+        sites = [f"{base}/site{i}" for i in range(args.sites)]
+
+    modes = ["per-request", "session"]
+    if scraper_v3.http2_available():
+        modes.append("http2")
+    report = {mode: run(sites, mode) for mode in modes}
+
+    print(f"{len(sites)} sites x {len(EDU_PATHS) + 1} pages\n")
+    print(f"{'transport':<12} {'pages/s':>9} {'seconds':>9} {'wire MB':>9}")
+    for mode, r in report.items():
+        print(f"{mode:<12} {r['pages_per_sec']:>9.1f} {r['seconds']:>9.2f} {r['mb']:>9.2f}")
+    if "http2" not in report:
+        print("\nhttp2 skipped: pip install 'httpx[http2]'")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Email verification benchmark
+Validates the emails of N synthetic result rows against a local stub resolver
+(fixed answers per domain, --latency-ms per lookup, like a DNS round trip) and
+compares one lookup per email in a row against EmailValidator: one lookup per
+domain, MX_WORKERS at a time, then a second batch served from its cache.
+Reports time, lookups made and the valid/invalid/unknown split, which must
+match the statuses the rows were built with.
+
+Before that it checks EmailValidator.domain() on fixed addresses and
+resolve_mx() against a stubbed dnspython and socket.getaddrinfo (MX answers,
+null MX, NXDOMAIN, NoAnswer, timeouts, errno mapping). Exits non-zero when a
+check or a status is wrong.
+
+Usage: python3 benchmarks/bench_verify.py [-n 1000] [--latency-ms 10] [--json OUT]
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import types
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper_v3  # noqa: E402
+from scraper_v3 import EmailValidator, resolve_mx, validate_results  # noqa: E402
+
+# Stub DNS: True has a mail host, False can't receive mail, None times out
+ZONES = {
+    **{f"school{i}.edu.np": True for i in range(150)},
+    **{f"gone{i}.com.np": False for i in range(30)},
+    "gmail.com": True,
+    "yahoo.com": True,
+    "flaky.org.np": None,
+}
+STATUS = {True: "valid", False: "invalid", None: "unknown"}
+JUNK = ["logo@2x.png", "banner@3x.webp", "user@domain"]  # all invalid
+
+# EmailValidator.domain(): address -> domain, None when it can't be real
+SYNTAX = [
+    ("info@school.edu.np", "school.edu.np"),
+    ("a@xn--p1ai.xn--p1ai", "xn--p1ai.xn--p1ai"),
+    ("office@xn--80ak6aa92e.com", "xn--80ak6aa92e.com"),
+    ("logo@2x.png", None),
+    ("banner@3x.webp", None),
+    ("user@domain", None),
+    ("@school.edu.np", None),
+    ("a@school.c0m", None),
+    ("a@school.xn--", None),
+]
+
+
+class StubResolver:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, domain: str) -> Optional[bool]:
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return ZONES.get(domain, False)
+
+
+def make_rows(n: int) -> Tuple[List[Dict], Dict[str, str]]:
+    """Rows and the status each of their emails must get."""
+    rng = random.Random(0)
+    domains = list(ZONES)
+    rows = []
+    expected = {}
+    for i in range(n):
+        domain = rng.choice(domains)
+        email = f"{rng.choice(['info', 'admin', 'office'])}{i}@{domain}"
+        expected[email] = STATUS[ZONES[domain]]
+        emails = [email]
+        if rng.random() < 0.2:
+            junk = rng.choice(JUNK)
+            expected[junk] = "invalid"
+            emails.append(junk)
+        rows.append({"website": f"https://site{i}.com.np", "emails": emails})
+    return rows, expected
+
+
+def stub_dns(answers: Dict[str, object]) -> Dict[str, types.ModuleType]:
+    """
+    A dns package whose resolver.resolve() answers from `answers`: a list of
+    MX hosts, or the name of the resolver exception to raise.
+    """
+    dns = types.ModuleType("dns")
+    exception = types.ModuleType("dns.exception")
+    resolver = types.ModuleType("dns.resolver")
+
+    class DNSException(Exception):
+        pass
+
+    class NXDOMAIN(DNSException):
+        pass
+
+    class NoAnswer(DNSException):
+        pass
+
+    class Timeout(DNSException):
+        pass
+
+    def resolve(domain, rdtype, lifetime=None):
+        answer = answers[domain]
+        if isinstance(answer, str):
+            raise getattr(resolver, answer)()
+        return [types.SimpleNamespace(exchange=host) for host in answer]
+
+    exception.DNSException = DNSException
+    resolver.NXDOMAIN, resolver.NoAnswer, resolver.Timeout = NXDOMAIN, NoAnswer, Timeout
+    resolver.resolve = resolve
+    dns.exception, dns.resolver = exception, resolver
+    return {"dns": dns, "dns.exception": exception, "dns.resolver": resolver}
+
+
+def stub_getaddrinfo(addresses: Dict[str, object]):
+    def getaddrinfo(host, port, *args, **kwargs):
+        answer = addresses[host]  # True, an EAI_* errno, or seconds to hang (float)
+        if isinstance(answer, float):
+            time.sleep(answer)
+        elif answer is not True:
+            raise socket.gaierror(answer, "stub")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 0))]
+
+    return getaddrinfo
+
+
+def check_resolve() -> List[str]:
+    failed = []
+
+    def check(name: str, got, want):
+        ok = got == want
+        print(f"{'ok' if ok else 'FAIL':<5} {name}" + ("" if ok else f": got {got!r}, want {want!r}"))
+        if not ok:
+            failed.append(name)
+
+    for email, domain in SYNTAX:
+        check(f"domain({email})", EmailValidator.domain(email), domain)
+
+    eai_nodata = getattr(socket, "EAI_NODATA", socket.EAI_NONAME)
+    saved_modules = {name: sys.modules.get(name) for name in ("dns", "dns.exception", "dns.resolver")}
+    saved_getaddrinfo = socket.getaddrinfo
+    saved_timeout = scraper_v3.MX_TIMEOUT
+    try:
+        scraper_v3.MX_TIMEOUT = 0.3
+        socket.getaddrinfo = stub_getaddrinfo(
+            {
+                "a-only.com": True,
+                "nothing.com": socket.EAI_NONAME,
+                "nodata.com": eai_nodata,
+                "servfail.com": socket.EAI_AGAIN,
+                "slow.com": 2.0,
+            }
+        )
+        answers = {
+            "mail.com": ["mx1.mail.com."],
+            "nullmx.com": ["."],
+            "gone.com": "NXDOMAIN",
+            "a-only.com": "NoAnswer",
+            "nothing.com": "NoAnswer",
+            "timeout.com": "Timeout",
+        }
+        sys.modules.update(stub_dns(answers))
+        check("MX record -> True", resolve_mx("mail.com"), True)
+        check('null MX "." -> False', resolve_mx("nullmx.com"), False)
+        check("NXDOMAIN -> False", resolve_mx("gone.com"), False)
+        check("NoAnswer, address record -> True", resolve_mx("a-only.com"), True)
+        check("NoAnswer, no address -> False", resolve_mx("nothing.com"), False)
+        check("DNS timeout -> None", resolve_mx("timeout.com"), None)
+
+        sys.modules["dns"] = None  # import dns raises ImportError: address lookups only
+        check("no dnspython, address -> True", resolve_mx("a-only.com"), True)
+        check("no dnspython, EAI_NONAME -> False", resolve_mx("nothing.com"), False)
+        check("no dnspython, EAI_NODATA -> False", resolve_mx("nodata.com"), False)
+        check("no dnspython, EAI_AGAIN -> None", resolve_mx("servfail.com"), None)
+        start = time.perf_counter()
+        check("no dnspython, hung resolver -> None", resolve_mx("slow.com"), None)
+        check("hung resolver gives up after MX_TIMEOUT", time.perf_counter() - start < 1.0, True)
+    finally:
+        scraper_v3.MX_TIMEOUT = saved_timeout
+        socket.getaddrinfo = saved_getaddrinfo
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return failed
+
+
+def per_email(rows: List[Dict], resolve: StubResolver) -> Dict[str, str]:
+    """The naive stage: every email looked up on its own, one after another."""
+    statuses = {}
+    for row in rows:
+        for email in row["emails"]:
+            domain = EmailValidator.domain(email)
+            statuses[email] = "invalid" if domain is None else EmailValidator.STATUS[resolve(domain)]
+    return statuses
+
+
+def timed(fn, resolve: StubResolver) -> Dict:
+    before = resolve.calls
+    start = time.perf_counter()
+    statuses = fn()
+    return {
+        "seconds": time.perf_counter() - start,
+        "lookups": resolve.calls - before,
+        "statuses": statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email verification")
+    parser.add_argument("-n", "--rows", type=int, default=1000, help="Result rows (default: 1000)")
+    parser.add_argument("--latency-ms", type=float, default=10, help="Per lookup (default: 10)")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    failed = check_resolve()
+
+    rows, expected = make_rows(args.rows)
+    resolve = StubResolver(args.latency_ms / 1000)
+    validator = EmailValidator(resolve)
+
+    def batched() -> Dict[str, str]:
+        return {
+            email: status
+            for row in validate_results(rows, validator)
+            for email, status in row["email_status"].items()
+        }
+
+    report = {
+        "per-email": timed(lambda: per_email(rows, resolve), resolve),
+        "batched": timed(batched, resolve),
+        "cached": timed(batched, resolve),
+    }
+    validator.close()
+
+    print(f"\n{args.rows} rows, {len(expected)} emails, {args.latency_ms:g} ms per lookup\n")
+    print(f"{'stage':<10} {'seconds':>8} {'lookups':>8} {'valid':>6} {'invalid':>8} {'unknown':>8}  correct")
+    for stage, r in report.items():
+        statuses = r.pop("statuses")
+        split = {s: sum(1 for v in statuses.values() if v == s) for s in ("valid", "invalid", "unknown")}
+        r.update(split, correct=statuses == expected)
+        if not r["correct"]:
+            failed.append(f"{stage} statuses")
+        print(
+            f"{stage:<10} {r['seconds']:>8.2f} {r['lookups']:>8} {r['valid']:>6} {r['invalid']:>8} "
+            f"{r['unknown']:>8}  {'yes' if r['correct'] else 'NO'}"
+        )
+    domains = {email.rpartition("@")[2] for email in expected if email not in JUNK}
+    unknown = sum(1 for domain in domains if ZONES[domain] is None)  # not cached, asked again
+    if report["batched"]["lookups"] != len(domains) or report["cached"]["lookups"] != unknown:
+        failed.append("one lookup per domain, cache hits after")
+    report["failed_checks"] = failed
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if failed:
+        print(f"\n{len(failed)} check(s) failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,20 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import json
-import csv
 import os
 import re
 import queue
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed, Future
+from concurrent.futures import ProcessPoolExecutor
 
 # ----------------------------------------------------------------------
 # Import the scraper (the huge script you posted earlier)
 # ----------------------------------------------------------------------
 try:
-    from scraper_v3 import ContactScraper, MapsScraper, save_results
+    from scraper_v3 import (
+        DRIVERS, MapsScraper, ScrapeStats, SiteDeduper, dedupe_sites, http2_available,
+        merge_results, open_sink, save_results, scrape_many, write_csv
+    )
 except Exception as e:
     messagebox.showerror(
         "Import Error",
@@ -25,20 +27,12 @@ except Exception as e:
     )
     raise SystemExit(1)
 
-
-# ----------------------------------------------------------------------
-# Helper wrappers – keep the scraper code untouched
-# ----------------------------------------------------------------------
-def scrape_one_site(url: str) -> dict:
-    """Run ContactScraper on a single URL and return its dict result."""
-    scraper = ContactScraper(url)
-    return scraper.run()
-
-
-def get_maps_sites(keywords: str, limit: int) -> list[str]:
-    """Run MapsScraper and return the list of website URLs."""
-    maps = MapsScraper(keywords, limit=limit)
-    return maps.run()
+# UI update budgets: the Tk loop drains at most this much per tick
+POLL_MS = 100
+LOGS_PER_TICK = 200
+RESULTS_PER_TICK = 500
+LOG_MAX_LINES = 2000      # console keeps only the newest lines
+RESULTS_PAGE_SIZE = 200   # rows shown in the results table at once
 
 
 # ----------------------------------------------------------------------
@@ -65,11 +59,12 @@ class ScraperGUI:
         self.num_sites_var = tk.IntVar(value=4)
         self.max_workers_var = tk.IntVar(value=12)
         self.save_results_var = tk.BooleanVar(value=True)
+        self.http2_var = tk.BooleanVar(value=False)
         self.file_path_var = tk.StringVar()
 
         self.is_running = False
-        self.executor: ThreadPoolExecutor | None = None
-        self.futures: dict[Future, str] = {}   # future → site URL
+        self.cancel: threading.Event | None = None   # stops the scrape_many batch
+        self.extractor: ProcessPoolExecutor | None = None   # parsing stage
         self.results: list[dict] = []
 
         self.log_queue: queue.Queue = queue.Queue()
@@ -77,6 +72,8 @@ class ScraperGUI:
 
         self.total_sites = 0
         self.completed = 0
+        self.stats: ScrapeStats | None = None   # engine metrics of the current run
+        self.page = 0
 
         self.setup_ui()
         self.process_queues()
@@ -164,6 +161,9 @@ class ScraperGUI:
         ttk.Checkbutton(
             f, text="Save results to JSON/CSV", variable=self.save_results_var
         ).grid(row=99, column=0, columnspan=2, sticky="w", pady=10)
+        ttk.Checkbutton(
+            f, text="Fetch over HTTP/2 (needs httpx[http2])", variable=self.http2_var
+        ).grid(row=100, column=0, columnspan=2, sticky="w")
 
         self.on_mode_change()   # initial visibility
 
@@ -220,6 +220,15 @@ class ScraperGUI:
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
         self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.tag_configure("row", font=self.tree_font)
+
+        # ---- Pager: only one page of rows lives in the Treeview ----
+        pager = ttk.Frame(res_tab)
+        pager.pack(fill="x", pady=(5, 0))
+        ttk.Button(pager, text="< Prev", command=lambda: self.show_page(self.page - 1)).pack(side="left")
+        ttk.Button(pager, text="Next >", command=lambda: self.show_page(self.page + 1)).pack(side="left", padx=5)
+        self.page_lbl = ttk.Label(pager, text="Page 1/1")
+        self.page_lbl.pack(side="left", padx=10)
 
     def create_bottom_buttons(self, parent):
         f = ttk.Frame(parent)
@@ -308,46 +317,86 @@ class ScraperGUI:
         self.result_queue.put(res)
 
     def process_queues(self):
-        # logs
-        while True:
+        # logs: one insert per run of same-tag lines, then trim to LOG_MAX_LINES
+        lines = []
+        while len(lines) < LOGS_PER_TICK:
             try:
-                msg, tag = self.log_queue.get_nowait()
-                ts = datetime.now().strftime("%H:%M:%S")
-                self.log_txt.insert("end", f"[{ts}] {msg}\n", tag)
-                self.log_txt.see("end")
+                lines.append(self.log_queue.get_nowait())
             except queue.Empty:
                 break
+        if lines:
+            ts = datetime.now().strftime("%H:%M:%S")
+            chunk, chunk_tag = [], lines[0][1]
+            for msg, tag in lines:
+                if tag != chunk_tag:
+                    self.log_txt.insert("end", "".join(chunk), chunk_tag)
+                    chunk, chunk_tag = [], tag
+                chunk.append(f"[{ts}] {msg}\n")
+            self.log_txt.insert("end", "".join(chunk), chunk_tag)
+            excess = int(self.log_txt.index("end-1c").split(".")[0]) - LOG_MAX_LINES
+            if excess > 0:
+                self.log_txt.delete("1.0", f"{excess + 1}.0")
+            self.log_txt.see("end")
 
         # results
-        while True:
+        added = 0
+        while added < RESULTS_PER_TICK:
             try:
                 res = self.result_queue.get_nowait()
-                self.results.append(res)
-                self._insert_tree_row(res)
-                self.completed += 1
-                self.progress["value"] = (self.completed / self.total_sites) * 100
-                self.status_lbl.config(
-                    text=f"Completed: {self.completed}/{self.total_sites}"
-                )
             except queue.Empty:
                 break
+            self.results.append(res)
+            self.completed += 1
+            added += 1
+        if added:
+            self._append_rows(len(self.results) - added)
+        self._update_status()
+
+        self.root.after(POLL_MS, self.process_queues)
+
+    def _update_status(self):
+        """Progress bar and status line from the engine metrics."""
+        stats = self.stats
+        if stats is None or not self.is_running:
+            return
+        done = stats.completed + stats.failed
+        total = max(self.total_sites, stats.submitted, 1)
+        self.progress["value"] = done / total * 100
+        rate = stats.rate
+        eta = f"{(total - done) / rate:.0f}s" if rate and total > done else "-"
+        self.status_lbl.config(
+            text=f"Completed: {done}/{total} · in flight: {stats.in_flight}"
+            f" · {rate:.2f} sites/s · ETA {eta}"
+        )
 
-        self.root.after(100, self.process_queues)
+    # ------------------------------------------------------------------
+    # Paged results table
+    # ------------------------------------------------------------------
+    def _page_count(self) -> int:
+        return max(1, -(-len(self.results) // RESULTS_PAGE_SIZE))
+
+    def _append_rows(self, start: int):
+        """New results only touch the table when they land on the visible page."""
+        first = self.page * RESULTS_PAGE_SIZE
+        last = first + RESULTS_PAGE_SIZE
+        for res in self.results[max(start, first):last]:
+            self._insert_tree_row(res)
+        self.page_lbl.config(text=f"Page {self.page + 1}/{self._page_count()}")
+
+    def show_page(self, page: int):
+        self.page = min(max(page, 0), self._page_count() - 1)
+        self.tree.delete(*self.tree.get_children())
+        self._append_rows(self.page * RESULTS_PAGE_SIZE)
 
     def _insert_tree_row(self, res: dict):
         emails = ", ".join(res.get("emails", [])) if isinstance(res.get("emails"), list) else res.get("emails", "")
         phones = ", ".join(res.get("numbers", [])) if isinstance(res.get("numbers"), list) else res.get("numbers", "")
-        item = self.tree.insert("", "end", values=(res["website"], emails, phones), )
-        self.tree.item(item, tags=("row",))
-
-    # Apply font to the whole row
-        self.tree.tag_configure("row", font=self.tree_font)
+        self.tree.insert("", "end", values=(res["website"], emails, phones), tags=("row",))
 
     def clear_logs(self):
         self.log_txt.delete("1.0", "end")
-        for i in self.tree.get_children():
-            self.tree.delete(i)
         self.results.clear()
+        self.show_page(0)
         self.log("Cleared logs & results", "info")
 
     # ------------------------------------------------------------------
@@ -386,26 +435,36 @@ class ScraperGUI:
         self.stop_btn.config(state="normal")
         self.progress["value"] = 0
         self.completed = 0
+        self.stats = None
         self.results.clear()
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self.show_page(0)
 
-        threading.Thread(target=self._scrape_worker, daemon=True).start()
+        # Stop sets this: in-flight fetches, renders and Maps scrolling end.
+        # Made here, not in the worker, so a Stop right after Start isn't lost.
+        self.cancel = threading.Event()
+        threading.Thread(target=self._scrape_worker, args=(self.cancel,), daemon=True).start()
 
     def _reset_run_state(self):
-        """Make sure a brand-new executor is used on every click."""
-        if self.executor:
-            self.executor.shutdown(wait=False, cancel_futures=True)
-            self.executor = None
-        self.futures = {}
+        """Make sure a brand-new batch is used on every click."""
+        self._cancel_batch()
+        self._shutdown_extractor()
         self.total_sites = 0
         self.completed = 0
 
+    def _cancel_batch(self):
+        if self.cancel:
+            DRIVERS.cancel(self.cancel)  # also quits its browsers mid page load
+            self.cancel = None
+
+    def _shutdown_extractor(self):
+        if self.extractor:
+            self.extractor.shutdown(wait=False, cancel_futures=True)
+            self.extractor = None
+
     def stop_scraping(self):
         self.is_running = False
-        if self.executor:
-            self.executor.shutdown(wait=False, cancel_futures=True)
-            self.executor = None
+        self._cancel_batch()
+        self._shutdown_extractor()
         self.start_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
         self.log("Scraping stopped by user", "warning")
@@ -414,84 +473,117 @@ class ScraperGUI:
     # ------------------------------------------------------------------
     # Core scraping worker (runs in its own thread)
     # ------------------------------------------------------------------
-    def _scrape_worker(self):
+    def _scrape_worker(self, cancel: threading.Event):
         try:
             mode = self.mode_var.get()
             max_workers = self.max_workers_var.get()
 
-            # ---- 1. Gather URLs -------------------------------------------------
+            # ---- 1. Gather URLs (Maps results are streamed in step 2) ----------
+            sites: list[str] = []
             if mode == "url":
                 sites = [self.url_var.get().strip()]
                 self.total_sites = 1
-            elif mode == "keywords":
-                self.log(f"Searching Google Maps: {self.keywords_var.get()}", "info")
-                sites = get_maps_sites(self.keywords_var.get(),
-                                      self.num_sites_var.get())
-                self.total_sites = len(sites)
-                self.log(f"Found {self.total_sites} sites", "success")
-            else:   # file
+            elif mode == "file":
                 path = self.file_path_var.get()
                 with open(path, "r", encoding="utf-8") as f:
                     sites = [line.strip() for line in f if line.strip()]
                 self.total_sites = len(sites)
                 self.log(f"Loaded {self.total_sites} URLs from file", "success")
-
-            if not sites:
+                if not sites:
+                    self.log("No sites to scrape", "error")
+                    return
+                sites, saved = dedupe_sites(sites)
+                if saved:
+                    self.total_sites = len(sites)
+                    self.log(f"Skipped {saved} duplicate sites (same domain)", "info")
+
+            # ---- 2. One scrape_many batch for THIS run --------------------------
+            if cancel.is_set():
+                return
+            # I/O threads fetch, a process pool parses (keeps the GIL free)
+            if mode != "url":
+                self.extractor = ProcessPoolExecutor(max_workers=os.cpu_count())
+            items = sites
+            deduper = None
+            if mode == "keywords":
+                # scrape each site as soon as Maps shows it
+                self.log(f"Searching Google Maps: {self.keywords_var.get()}", "info")
+                self.total_sites = self.num_sites_var.get()
+                deduper = SiteDeduper()
+                maps = MapsScraper(
+                    self.keywords_var.get(), limit=self.total_sites, cancel=cancel
+                )
+                items = maps.stream()
+
+            transport = "requests"
+            if self.http2_var.get():
+                if http2_available():
+                    transport = "http2"
+                else:
+                    self.log("httpx[http2] is not installed, using HTTP/1.1", "warning")
+
+            # ---- 3. Consume results as they complete ---------------------------
+            stats = self.stats = ScrapeStats()
+            rows = []   # the table drains its queue lazily; save from this list
+            for result in scrape_many(
+                items,
+                concurrency=max_workers,
+                extractor=self.extractor,
+                deduper=deduper,
+                on_error=lambda url, exc: rows.append(self._on_error(url, exc)),
+                cancel=cancel,
+                stats=stats,
+                transport=transport,
+            ):
+                rows.append(result)
+                self.add_result(result)
+
+            if mode == "keywords":
+                self.log(f"Found {stats.submitted} sites", "success")
+            if stats.duplicates:
+                self.log(f"Skipped {stats.duplicates} duplicate sites (same domain)", "info")
+            if not stats.submitted:
                 self.log("No sites to scrape", "error")
                 return
+            self.log(stats.summary(), "info")
 
-            # ---- 2. **NEW** ThreadPoolExecutor for THIS run --------------------
-            self.executor = ThreadPoolExecutor(max_workers=max_workers)
-            self.futures = {
-                self.executor.submit(scrape_one_site, url): url for url in sites
-            }
-
-            # ---- 3. Consume futures --------------------------------------------
-            for future in as_completed(self.futures):
-                if not self.is_running:
-                    break
-                url = self.futures[future]
-                try:
-                    result = future.result()
-                except Exception as exc:
-                    result = {"website": url, "emails": "Error", "numbers": "Error"}
-                    self.log(f"{url} → {exc}", "error")
-                finally:
-                    self.add_result(result)
-
-            # ---- 4. Clean shutdown of the pool ---------------------------------
-            self.executor.shutdown(wait=True)
-
-            # ---- 5. Auto-save --------------------------------------------------
-            if self.save_results_var.get() and self.results:
-                self._auto_save()
+            # ---- 4. Auto-save --------------------------------------------------
+            if self.save_results_var.get() and rows:
+                self._auto_save(rows)
 
             self.log("Scraping finished", "success")
         except Exception as e:
             self.log(f"Fatal error: {e}", "error")
         finally:
-            self.root.after(0, self._finished)
+            self.root.after(0, self._finished, cancel)
 
 
 
 
-    def _finished(self):
+    def _on_error(self, url: str, exc: Exception) -> dict:
+        """Show a failed site as an "Error" row; returns it so auto-save keeps it too."""
+        self.log(f"{url} → {exc}", "error")
+        row = {"website": url, "emails": "Error", "numbers": "Error"}
+        self.add_result(row)
+        return row
+
+    def _finished(self, cancel: threading.Event):
+        if self.cancel is not None and cancel is not self.cancel:
+            return  # a stopped run ending after Start began a new one
         self.is_running = False
         self.start_btn.config(state="normal")
         self.stop_btn.config(state="disabled")
         self.progress["value"] = 100
         self.status_lbl.config(text="Finished")
-        # **IMPORTANT** – release the executor so the next run gets a fresh one
-        if self.executor:
-            self.executor.shutdown(wait=False, cancel_futures=True)
-            self.executor = None
-        self.futures = {}
+        # **IMPORTANT** – release the batch so the next run gets a fresh one
+        self._cancel_batch()
+        self._shutdown_extractor()
 
 
     # ------------------------------------------------------------------
     # Export / auto-save
     # ------------------------------------------------------------------
-    def _auto_save(self):
+    def _auto_save(self, rows: list[dict]):
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         base = {
             "url": "single",
@@ -500,7 +592,7 @@ class ScraperGUI:
         }[self.mode_var.get()]
 
         name = f"contacts_[{base}]_{timestamp}"
-        save_results(self.results, name)
+        save_results(merge_results(rows), name)
         self.log(f"Auto-saved → json_data/{name}.json", "success")
 
     def export_results(self):
@@ -509,7 +601,10 @@ class ScraperGUI:
             return
         path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")]
+            filetypes=[
+                ("JSON", "*.json"), ("CSV", "*.csv"), ("JSON Lines", "*.jsonl"),
+                ("JSON Lines (gzip)", "*.jsonl.gz"), ("Parquet", "*.parquet"),
+            ]
         )
         if not path:
             return
@@ -517,11 +612,15 @@ class ScraperGUI:
             if path.endswith(".json"):
                 with open(path, "w", encoding="utf-8") as f:
                     json.dump(self.results, f, indent=2, ensure_ascii=False)
+            elif path.endswith(".csv"):
+                write_csv(self.results, path)
             else:
-                with open(path, "w", newline="", encoding="utf-8") as f:
-                    w = csv.DictWriter(f, fieldnames=self.results[0].keys())
-                    w.writeheader()
-                    w.writerows(self.results)
+                sink = open_sink(path)
+                try:
+                    for row in self.results:
+                        sink.write(row)
+                finally:
+                    sink.close()
             self.log(f"Exported → {path}", "success")
             messagebox.showinfo("Export", f"Saved to\n{path}")
         except Exception as e:
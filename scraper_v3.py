@@ -4,41 +4,106 @@ Google Maps Website Scraper
 Extracts emails and Nepali phone numbers from business websites.
 """
 import argparse
+import gzip
+import importlib
 import os
 import json
 import csv
+import random
 import re
+import socket
+import sqlite3
 import time
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime
 from pprint import pprint
-from typing import List, Set, Dict
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Set, Dict, Tuple
 import urllib.parse
 from urllib.parse import urlparse
-import requests
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from colorama import init, Fore, Style
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-import urllib3
+import queue
+import threading
 import warnings
-import pdb
 
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
-# disable Insecure Connection Warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+if TYPE_CHECKING:
+    from selenium.webdriver.firefox.options import Options
+
 init()  # Initialize colorama
 
 DEBUGGER=False
 
+# ==============================
+# Lazy Imports
+# ==============================
+class _LazyModule:
+    """
+    Stand-in for a heavy dependency, imported on first attribute access so
+    `--help`, static-only runs and extractor processes don't pay for selenium.
+    """
+
+    def __init__(self, name: str, on_import: Optional[Callable] = None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import:
+                self._on_import(module)
+            self._module = module
+        return getattr(self._module, attr)
+
+
+def _quiet_bs4(module):
+    warnings.filterwarnings("ignore", category=module.XMLParsedAsHTMLWarning)
+
+
+def _quiet_requests(module):
+    # disable Insecure Connection Warnings
+    module.packages.urllib3.disable_warnings(
+        module.packages.urllib3.exceptions.InsecureRequestWarning
+    )
+
+
+requests = _LazyModule("requests", _quiet_requests)
+bs4 = _LazyModule("bs4", _quiet_bs4)
+webdriver = _LazyModule("selenium.webdriver")
+
+
 # ==============================
 # Configuration & Constants
 # ==============================
+# (framework, weight, needles, regex): a fingerprint hits when any lowercase
+# needle is in the page and, if given, the regex confirms it on the lowered page
+SPA_FINGERPRINTS = [
+    # React / Next.js
+    ("react", 3, ("root", "__next"), r"""<div[^>]*\bid=["'](?:root|__next)["'][^>]*>\s*</div>"""),
+    ("react", 2, ("data-reactroot", "data-reactid", "data-react-root"), None),
+    ("react", 2, ("react",), r"react(?:-dom)?(?:\.production)?(?:\.min)?\.js"),
+    ("react", 2, ("/_next/static/", "__next_data__"), None),
+    ("react", 1, ("/static/js/main.",), r"/static/js/main\.[0-9a-f]+\.js"),
+    # Vue / Nuxt
+    ("vue", 3, ("app", "__nuxt"), r"""<div[^>]*\bid=["'](?:app|__nuxt)["'][^>]*>\s*</div>"""),
+    ("vue", 3, ("__vue_app__", "__vue__"), None),
+    ("vue", 2, ("vue.", "@vue/runtime-core", "vue-devtools"),
+     r"vue(?:\.global)?(?:\.prod)?(?:\.min)?\.js|@vue/runtime-core|vue-devtools"),
+    ("vue", 2, ("__nuxt__", "/_nuxt/"), None),
+    ("vue", 1, ("vue.config", "vue.createapp", "new vue(", "runtime-dom", "/js/chunk-vendors."), None),
+    ("vue", 0.5, ("data-v-", "app"), r"""\bdata-v-[0-9a-f]{6,8}\b|\bid=["']app["']"""),
+]
+SPA_RENDER_THRESHOLD = 3  # fingerprint score (minus server-content credit) needed to render
+SPA_TEXT_WORDS = 150  # server HTML with this much visible text is already rendered
+
+
 class Patterns:
     EMAIL = re.compile(
         r"[a-zA-Z0-9._%+-]+\s*(?:@|\[at\]|\(at\))\s*[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
@@ -52,10 +117,10 @@ class Patterns:
         r"""
         \b(?:\+?977[-\.\s]?)? # Optional +977
         (?:0[-\.\s]?)? # Optional leading 0
-        ( # Area code OR mobile prefix
-            1[-\.\s]?\d{7} # Kathmandu: 1-4261234 → 014261234
+        ( # Mobile prefix OR area code (mobiles first: 98x would pass as an area code)
+            9[78]\d[-\.\s]?\d{7} # Mobiles: 9841-234567
+            | 1[-\.\s]?\d{7} # Kathmandu: 1-4261234 → 014261234
             | [2-9]\d[-\.\s]?\d{5} # Other landlines: 61-531234 → 061531234
-            | 9[78]\d[-\.\s]?\d{7} # Mobiles: 9841 234 567
         )\b
         """,
         re.VERBOSE | re.IGNORECASE,
@@ -66,9 +131,9 @@ class Patterns:
         (?:\+?977[-\.\s]?)? # +977
         (?:0[-\.\s]?)? # leading 0
         (
-            1[-\.\s]?\d{7} # 01-xxxxxxx
+            9[78]\d(?:[-\.\s]+\d{1,4}){2,7} # ← MOBILE: any separators
+            | 1[-\.\s]?\d{7} # 01-xxxxxxx
             | [2-9]\d[-\.\s]?\d{5} # 61-xxxxx
-            | 9[78]\d(?:[-\.\s]+\d{1,4}){2,7} # ← MOBILE: any separators
         )
         \b
         """,
@@ -80,14 +145,15 @@ class Patterns:
         (?:\+?977[-\.\s]?)??   # Optional +977
         (?:0[-\.\s]?)?         # Optional leading 0
         (
+            # Mobiles: 97x/98x + exactly 7 digits (before the landlines,
+            # which would take "9841 234 " as area code 98)
+            9[78]\d[-\.\s]?(?:\d[-\.\s]*){7}
+    
             # Kathmandu: 1 + exactly 7 digits (any separators)
-            1[-\.\s]?(?:\d[-\.\s]*){7}
+            | 1[-\.\s]?(?:\d[-\.\s]*){7}
     
             # Other landlines: 2-9X + exactly 5 digits
             | [2-9]\d[-\.\s]?(?:\d[-\.\s]*){5}
-    
-            # Mobiles: 97x/98x + exactly 7 digits
-            | 9[78]\d[-\.\s]?(?:\d[-\.\s]*){7}
         )
         \b
         """,
@@ -116,6 +182,44 @@ class Patterns:
         re.VERBOSE | re.IGNORECASE,
     )
 
+    EMAIL_AT = re.compile(r"\s*(?:@|\[at\]|\(at\))\s*", re.IGNORECASE)
+
+    # SPA sources: inline <script> blocks, phone-ish keys in JS and API endpoints
+    SCRIPT_TAG = re.compile(r"<script\b([^>]*)>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+    SCRIPT_ATTR = re.compile(r"""\b(src|id|type)\s*=\s*["']([^"']*)["']""", re.IGNORECASE)
+    SCRIPT_PHONE = re.compile(
+        r"(?:tel:|phone|mobile|telephone|contact)[^0-9+\n]{0,25}(\+?[0-9][0-9\s\-.]{6,18}[0-9])",
+        re.IGNORECASE,
+    )
+    # A phone-ish word in a JSON key, at word or camelCase boundaries: "phone",
+    # "contactPhone", "tel_no", "MOBILE" but not "hotel", "telemetry", "cellphone"
+    PHONE_KEY = re.compile(
+        r"(?:^|(?<=[^a-zA-Z])|(?<=[a-z])(?=[A-Z]))"
+        r"(?:[Pp]hone|[Tt]el(?:ephone)?|[Mm]obile|[Cc]ontact|[Ff]ax"
+        r"|PHONE|TEL(?:EPHONE)?|MOBILE|CONTACT|FAX)"
+        r"(?:s|number|no|num)?(?![a-z])"
+    )
+    API_ENDPOINT = re.compile(
+        r"""["'`]((?:https?://[^"'`\s]+)?/(?:api|wp-json)/[^"'`\s]*|[^"'`\s<>]+\.json)["'`]"""
+    )
+
+    # Structured data: microdata itemprops and vCard links
+    ITEMPROP = re.compile(
+        r"""<[a-z0-9]+([^>]*\bitemprop\s*=\s*["'](telephone|email)["'][^>]*)>([^<]*)""",
+        re.IGNORECASE,
+    )
+    ATTR_CONTENT = re.compile(r"""\b(?:content|href)\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+    VCARD_LINK = re.compile(r"""href\s*=\s*["']([^"']+\.vcf)(?:\?[^"']*)?["']""", re.IGNORECASE)
+
+    SPA_FINGERPRINT = [
+        (framework, weight, needles, re.compile(regex) if regex else None)
+        for framework, weight, needles, regex in SPA_FINGERPRINTS
+    ]
+    NON_VISIBLE = re.compile(
+        r"<(script|style|noscript|template)\b.*?</\1>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+    )
+    TAG = re.compile(r"<[^>]+>")
+
     ABOUT_PAGE = re.compile(
         r"(?:https?://)?(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
         r"(?:/[^\s]*?)?(?:about|contact|reach-us|team|info)[^\s<>\"]*",
@@ -123,14 +227,6 @@ class Patterns:
     )
 
 
-REACT_INDICATORS = [
-    'id="root"',
-    "id='root'",
-    "[data-reactroot]",
-    "[data-reactid]",
-    "[data-react-root]",
-    "react",
-]
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15",
@@ -172,6 +268,55 @@ EDU_PATHS = [
     # # Legal
     # "/privacy-policy", "/sitemap", "/sitemap.xml",
 ]
+# Second-level labels used under ccTLDs (ku.edu.np, nepalbiz.com.np, bbc.co.uk)
+SECOND_LEVEL_LABELS = {"edu", "com", "org", "gov", "net", "mil", "co", "ac"}
+# Hosts shared by unrelated businesses; dedup on the full URL instead of the domain
+SHARED_HOSTS = {
+    "facebook.com",
+    "instagram.com",
+    "linktr.ee",
+    "google.com",
+    "blogspot.com",
+    "wixsite.com",
+    "wordpress.com",
+    "business.site",
+}
+# Inline scripts that carry SPA state worth mining before rendering
+SPA_STATE_MARKERS = [
+    "__NEXT_DATA__",
+    "__NUXT__",
+    "__INITIAL_STATE__",
+    "__PRELOADED_STATE__",
+    "__APOLLO_STATE__",
+]
+SPA_FETCH_LIMIT = 4  # bundles / endpoints fetched per site before giving up
+MAX_SEEN_LINKS = 256  # same-site links remembered (and followed) per site
+FETCH_CHUNK = 16 * 1024  # bodies are read in chunks so a cancel can cut a download short
+RENDER_TIMEOUT = 20  # seconds Selenium may spend loading a page
+CANCEL_POLL = 0.2  # how often a waiting scrape_many() looks at its cancel Event
+CACHE_TTL_DAYS = 7.0  # cached site results younger than this are served without scraping
+RETRY_ATTEMPTS = 3  # tries per request for transient errors (resets, timeouts, 429/5xx)
+RETRY_BACKOFF = 0.5  # base of the jittered exponential backoff, in seconds
+RETRY_MAX_BACKOFF = 8.0
+BREAKER_FAILURES = 5  # consecutive host failures before its circuit opens
+BREAKER_COOLDOWN = 60.0  # seconds an open circuit fails fast before one trial request
+ROBOTS_TTL_HOURS = 24.0  # robots.txt kept in the -c cache file this long
+ROBOTS_MAX_DELAY = 10.0  # cap on a host's Crawl-delay, in seconds
+HTTP_TRANSPORT = "requests"  # default transport; "http2" fetches over httpx (optional)
+MX_WORKERS = 16  # concurrent MX lookups of --verify-emails
+MX_TIMEOUT = 3.0  # seconds per DNS lookup
+MX_CACHE_TTL = 86400.0  # how long a domain's answer is reused, in seconds
+MX_NEGATIVE_TTL = 3600.0  # same for domains that can't receive mail
+# "user@2x.png": matches the email pattern, but the "TLD" is a file extension
+FILE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "bmp", "css", "js", "pdf"}
+OUTPUT_FORMATS = ["json", "jsonl", "jsonl.gz", "parquet"]  # "json" also writes the CSV
+PARQUET_ROW_GROUP = 10000  # rows buffered per Parquet row group
+# A site counts as satisfied (no more crawling/rendering) at this many contacts
+MIN_EMAILS = 1
+MIN_PHONES = 1
+# Google Maps result cards: the feed's <div>s that hold a /maps/place/ link
+MAPS_CARD_XPATH = '//div[@role="feed"]//div[a[contains(@href, "/maps/place/")]]'
+MAPS_BROWSERS = 3  # Firefox instances shared by a multi-query Maps batch
 CONTACT_KEYWORDS = [
     "contact",
     "email",
@@ -185,6 +330,65 @@ CONTACT_KEYWORDS = [
     "address",
     "location",
 ]
+# What to crawl beyond the homepage, per kind of site (-P/--profile or a JSON file):
+# paths are probed in priority order (reordered by PATH_STATS as a run learns
+# which ones pay off), same-site links are followed best link_keywords score
+# first, and both stop as soon as the site is resolved or its budget is spent
+CRAWL_PROFILES = {
+    "edu": {
+        "name": "edu",
+        "paths": EDU_PATHS,
+        "link_keywords": {"contact": 3, "reach": 2, "about": 1},
+        "max_paths": len(EDU_PATHS),
+        "max_links": 10,
+    },
+    "business": {
+        "name": "business",
+        "paths": [
+            "/contact",
+            "/contact-us",
+            "/contact/",
+            "/get-in-touch",
+            "/about",
+            "/about-us",
+            "/locations",
+            "/support",
+        ],
+        "link_keywords": {"contact": 3, "support": 2, "location": 2, "about": 1, "team": 1},
+        "max_paths": 6,
+        "max_links": 8,
+    },
+    "government": {
+        "name": "government",
+        "paths": [
+            "/contact",
+            "/contact-us",
+            "/en/contact",
+            "/directory",
+            "/staff",
+            "/officials",
+            "/information-officer",
+            "/about",
+        ],
+        "link_keywords": {
+            "contact": 3,
+            "directory": 2,
+            "officer": 2,
+            "staff": 2,
+            "official": 1,
+            "about": 1,
+        },
+        "max_paths": 8,
+        "max_links": 12,
+    },
+}
+DEFAULT_PROFILE = "edu"
+# Learned probe order (PATH_STATS): a path or link type with PATH_MIN_TRIES probes
+# and a hit rate under PATH_PRUNE_RATE is skipped, except for PATH_EXPLORE of sites
+PATH_MIN_TRIES = 20
+PATH_PRUNE_RATE = 0.02
+PATH_EXPLORE = 0.05
+PATH_SAVE_EVERY = 50  # sites between saves of PATH_STATS, so a crash keeps most of a run
 
 
 # ==============================
@@ -202,148 +406,1150 @@ def log_error(msg: str):
     print(Fore.RED + f"[ERROR] {msg}" + Style.RESET_ALL)
 
 
-# def normalize_phone(phone: str) -> Optional[str]:
-# digits = re.sub(r"\D", "", phone)
-# if 9 <= len(digits) <= 15 and digits[0] in "09456":
-# return digits
-# return None
+def classify_spa(html: str) -> Tuple[Optional[str], float]:
+    """
+    Score the page's SPA fingerprints and credit server HTML that already
+    carries text or contact info. Returns (framework, score); framework is
+    "react"/"vue" only when score reaches SPA_RENDER_THRESHOLD.
+    """
+    # Substring needles are C-speed scans; the few confirming regexes only run
+    # on pages that contain their needle
+    lowered = html.lower()
+    scores = {"react": 0.0, "vue": 0.0}
+    for framework, weight, needles, regex in Patterns.SPA_FINGERPRINT:
+        if any(n in lowered for n in needles) and (regex is None or regex.search(lowered)):
+            scores[framework] += weight
+    framework = max(scores, key=scores.get)
+    score = scores[framework]
+    if score < SPA_RENDER_THRESHOLD:  # content checks can only lower it
+        return None, score
+
+    # Already server-rendered? Then the static passes will see what a browser sees
+    text = Patterns.TAG.sub(" ", Patterns.NON_VISIBLE.sub(" ", lowered))
+    if len(text.split()) >= SPA_TEXT_WORDS:
+        score -= 2
+    if "mailto:" in lowered or "tel:" in lowered:
+        score -= 2
+    if any(kw in text for kw in ("contact", "phone", "email")):
+        score -= 1
+    return (framework if score >= SPA_RENDER_THRESHOLD else None), score
+
+
+def get_root_domain(url: str) -> str:
+    """Extract the root domain (e.g., example.edu.np) from URL."""
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    domain = (parsed.hostname or "").lower()
+    parts = domain.split(".")
+    # For .edu.np/.com.np etc., include the organisation name as root
+    if len(parts) >= 3 and parts[-2] in SECOND_LEVEL_LABELS and len(parts[-1]) == 2:
+        return ".".join(parts[-3:])
+    # Fallback for other domains (e.g., example.com)
+    if len(parts) >= 2:
+        return ".".join(parts[-2:])
+    return domain
+
+
+def get_tld(url: str) -> str:
+    """The suffix under the organisation: "edu.np" for ku.edu.np, "com" for example.com."""
+    return get_root_domain(url).partition(".")[2]
+
+
+@lru_cache(maxsize=2)
+def firefox_options(headless: bool = True) -> "Options":
+    """Selenium options shared by every driver instead of being built per site."""
+    from selenium.webdriver.firefox.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    return options
+
+
+class DriverRegistry:
+    """
+    Live Selenium drivers per cancel Event. driver.get() and page loads never
+    look at the Event, so cancel() sets it and quits the batch's browsers from
+    the cancelling thread; the blocked calls then fail and the scrape unwinds.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.drivers: Dict[threading.Event, Set] = {}
+
+    def add(self, cancel: Optional[threading.Event], driver):
+        if cancel is not None:
+            with self.lock:
+                self.drivers.setdefault(cancel, set()).add(driver)
+
+    def discard(self, cancel: Optional[threading.Event], driver):
+        if cancel is not None:
+            with self.lock:
+                self.drivers.get(cancel, set()).discard(driver)
+
+    def cancel(self, cancel: threading.Event):
+        cancel.set()
+        self.release(cancel)
+
+    def release(self, cancel: threading.Event):
+        """Quit the drivers still registered under cancel, without setting it."""
+        with self.lock:
+            drivers = self.drivers.pop(cancel, set())
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+DRIVERS = DriverRegistry()
+
+
+class _DigitTable(dict):
+    """
+    str.translate table that keeps ASCII and Devanagari digits (as ASCII)
+    and deletes every other character; unseen characters are cached as deletions
+    """
+
+    def __missing__(self, key):
+        self[key] = None
+        return None
+
+
+_DIGIT_TABLE = _DigitTable({ord(d): d for d in "0123456789"})
+_DIGIT_TABLE.update({0x0966 + i: str(i) for i in range(10)})  # ० - ९
+_DEVANAGARI_TABLE = {0x0966 + i: str(i) for i in range(10)}
+_DEVANAGARI_DIGIT = re.compile("[\u0966-\u096f]")
+
+
+@lru_cache(maxsize=65536)  # footers repeat the same numbers on every page
 def normalize_phone(phone: str) -> Optional[str]:
-    """Returns clean 10-digit string or None"""
-    digits = re.sub(r"\D", "", phone)  # Kill spaces/dashes/dots
+    """
+    Returns the canonical form of a Nepali number or None:
+    Kathmandu valley 01XXXXXXX, other landlines 0AAXXXXXX, mobiles 9XXXXXXXXX
+    """
+    digits = phone.translate(_DIGIT_TABLE)  # Kill spaces/dashes/dots/+
 
-    # +977 prefix
-    if digits.startswith("977"):
+    # 00977 / +977 prefix
+    if digits.startswith("00"):
+        digits = digits[2:]
+    if len(digits) > 10 and digits.startswith("977"):
         digits = digits[3:]
 
-    # Leading 0
+    # Leading trunk 0
     if digits.startswith("0"):
         digits = digits[1:]
 
-    # Must be exactly 10 digits
-    if 7 > len(digits) > 15:
+    if len(digits) == 10:
+        # NTC/Ncell/Smart mobiles: 96x, 97x, 98x
+        if digits[0] == "9" and digits[1] in "678":
+            return digits
         return None
+    if len(digits) == 8:
+        if digits[0] == "1":  # Kathmandu valley landline
+            return "0" + digits
+        if digits[0] in "23456789" and digits[1] != "0":  # 2-digit area code
+            return "0" + digits
+    return None
+
 
-    first = digits[0]
-    if first == "1":  # Kathmandu landline
-        return "01" + digits[1:]
-    if "2" <= first <= "9":  # Other landlines
-        return "0" + digits[:2] + digits[2:]
-    if first in "89":  # NTC/Ncell mobiles
-        return "9" + digits[1:] if first == "9" else digits
+@lru_cache(maxsize=65536)
+def normalize_email(email: str) -> Optional[str]:
+    """Returns lowercase address with [at]/(at) resolved, or None if not an email"""
+    email = Patterns.EMAIL_AT.sub("@", email.strip(), count=1).lower().rstrip(".")
+    if Patterns.EMAIL_STRICT.fullmatch(email):
+        return email
+    return None
+
+
+class ContactStore:
+    """
+    Canonical contacts of a single site.
+    Values are normalized on insert and map to the page they were first seen on.
+    """
+
+    __slots__ = ("emails", "phones")
+
+    def __init__(self):
+        self.emails: Dict[str, str] = {}
+        self.phones: Dict[str, str] = {}
+
+    def add_email(self, raw: str, source: str = "") -> bool:
+        email = normalize_email(raw)
+        if email is None or email in self.emails:
+            return False
+        self.emails[email] = source
+        return True
+
+    def add_phone(self, raw: str, source: str = "") -> bool:
+        phone = normalize_phone(raw)
+        if phone is None or phone in self.phones:
+            return False
+        self.phones[phone] = source
+        return True
+
+    def discard_email(self, email: str):
+        self.emails.pop(email, None)
+
+    def update(self, emails: Dict[str, str], phones: Dict[str, str]):
+        """Merge already canonical values, keeping the first-seen page."""
+        for email, source in emails.items():
+            self.emails.setdefault(email, source)
+        for phone, source in phones.items():
+            self.phones.setdefault(phone, source)
+
+
+# ==============================
+# Page Extraction (CPU stage)
+# ==============================
+def _add_phones(text: str, store: ContactStore, source: str) -> set:
+    phones = set()
+    if _DEVANAGARI_DIGIT.search(text):  # the patterns only know ASCII digits
+        text = text.translate(_DEVANAGARI_TABLE)
+    for pattern in (
+        Patterns.PHONE_NP,
+        Patterns.NEW_PHONE_NP,
+        Patterns.NEW_NEW_PHONE_NP,
+        Patterns.OTHER_PHONE_NP,
+    ):
+        for match in pattern.finditer(text):
+            norm = normalize_phone(match.group())
+            if norm:
+                phones.add(norm)
+                store.add_phone(norm, source)
+    return phones
+
+
+def _extract_contact_sections(soup: "bs4.BeautifulSoup", store: ContactStore, source: str) -> set:
+    phones = set()
+    sections = []
+    # 1. Find <div>, <section>, <p> with contact keywords
+    for tag in soup.find_all(["div", "section", "p", "li", "span", "footer", "a"]):
+        text = tag.get_text()
+        if any(kw in text.lower() for kw in CONTACT_KEYWORDS):
+            sections.append(text)
+    # 2. Bonus: Footer is gold
+    footer = soup.find("footer")
+    if footer:
+        sections.append(footer.get_text())
+
+    for text in sections:
+        # Extract phones ONLY from this tag
+        phones |= _add_phones(text, store, source)
+
+        for pattern in (Patterns.EMAIL, Patterns.EMAIL_STRICT):
+            for match in pattern.finditer(text):
+                store.add_email(match.group(), source)
+    return phones
+
+
+def _walk_json_ld(node, store: ContactStore, source: str):
+    if isinstance(node, list):
+        for v in node:
+            _walk_json_ld(v, store, source)
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            key = k.split(":")[-1].lower()  # "schema:telephone" -> "telephone"
+            values = v if isinstance(v, list) else [v]
+            if key == "email":
+                for value in values:
+                    if isinstance(value, str):
+                        store.add_email(value.replace("mailto:", ""), source)
+            elif key == "telephone":
+                for value in values:
+                    if isinstance(value, (str, int)):
+                        store.add_phone(str(value).replace("tel:", ""), source)
+            else:
+                _walk_json_ld(v, store, source)
+
+
+def parse_vcard(data, source: str = "", encoding: Optional[str] = None) -> Dict:
+    """TEL/EMAIL properties of a .vcf file."""
+    if isinstance(data, bytes):
+        data = data.decode(encoding or "utf-8", errors="replace")
+    store = ContactStore()
+    for line in data.splitlines():
+        key, _, value = line.partition(":")
+        name = key.split(";")[0].split(".")[-1].upper()  # item1.TEL;TYPE=work
+        if name == "TEL":
+            store.add_phone(value.replace("tel:", ""), source)
+        elif name == "EMAIL":
+            store.add_email(value, source)
+    return {"emails": store.emails, "phones": store.phones}
+
+
+def _extract_structured(html: str, store: ContactStore, source: str) -> List[str]:
+    """JSON-LD and microdata contacts into store; returns linked .vcf files."""
+    # cheap substring checks first, most pages have neither
+    if "ld+json" in html:
+        for attrs, body in Patterns.SCRIPT_TAG.findall(html):
+            if "ld+json" not in attrs:
+                continue
+            try:
+                _walk_json_ld(json.loads(body, strict=False), store, source)
+            except ValueError:
+                continue
+    if "itemprop" in html:
+        for attrs, prop, text in Patterns.ITEMPROP.findall(html):
+            attr = Patterns.ATTR_CONTENT.search(attrs)
+            value = attr.group(1) if attr else text
+            value = re.sub(r"^(?:mailto|tel):", "", value.strip())
+            if prop.lower() == "email":
+                store.add_email(value, source)
+            else:
+                store.add_phone(value, source)
+    if ".vcf" in html:
+        return list(dict.fromkeys(Patterns.VCARD_LINK.findall(html)))
+    return []
+
+
+def extract_structured_data(html, source: str = "", encoding: Optional[str] = None) -> Dict:
+    """
+    Fast path: schema.org JSON-LD (Organization/LocalBusiness/ContactPoint
+    telephone and email), microdata itemprops and .vcf links, without parsing
+    the whole document.
+    """
+    if isinstance(html, bytes):
+        html = bs4.UnicodeDammit(html, [encoding] if encoding else []).unicode_markup or ""
+    store = ContactStore()
+    vcards = _extract_structured(html, store, source)
+    return {"emails": store.emails, "phones": store.phones, "vcards": vcards}
+
+
+def extract_contacts(html, source: str = "", encoding: Optional[str] = None) -> Dict:
+    """
+    Parse a single page (str, or raw bytes + optional encoding) and return
+    {"emails": {email: source}, "phones": {phone: source}, "links": [absolute hrefs]}.
+    Module-level and side-effect free so it can run in a ProcessPoolExecutor.
+    """
+    if isinstance(html, bytes):
+        html = bs4.UnicodeDammit(html, [encoding] if encoding else []).unicode_markup or ""
+    store = ContactStore()
+    links = []
+    # Structured data first, so its values keep priority as first-seen
+    _extract_structured(html, store, source)
+    # Emails
+    for email in Patterns.EMAIL.findall(html):
+        store.add_email(email, source)
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    # Extract mailto:/tel: links and outgoing hyperlinks
+    for link in soup("a"):
+        href = link.get("href")
+        if not href:
+            continue
+        href = str(href)
+        if href.startswith("mailto:"):
+            store.add_email(urllib.parse.unquote(href[7:].split("?")[0]), source)
+        elif href.startswith("tel:"):
+            # same canonical form as text matches
+            store.add_phone(urllib.parse.unquote(href[4:]), source)
+        elif href.startswith("http"):
+            links.append(href)
 
+    # Phones
+    _extract_contact_sections(soup, store, source)
+    return {
+        "emails": store.emails,
+        "phones": store.phones,
+        "links": list(dict.fromkeys(links)),
+    }
+
+
+# ==============================
+# SPA Data Extraction (CPU stage)
+# ==============================
+def _walk_json(node, key: str, store: ContactStore, source: str):
+    if isinstance(node, dict):
+        for k, v in node.items():
+            _walk_json(v, str(k), store, source)
+    elif isinstance(node, list):
+        for v in node:
+            _walk_json(v, key, store, source)
+    elif isinstance(node, str):  # numbers under such keys are mostly IDs
+        value = node
+        if "@" in value:
+            for email in Patterns.EMAIL_STRICT.findall(value):
+                store.add_email(email, source)
+        if key and Patterns.PHONE_KEY.search(key):
+            if not _add_phones(value, store, source):
+                store.add_phone(value, source)
+
+
+def mine_script(data, source: str = "", encoding: Optional[str] = None) -> Dict:
+    """
+    Contacts and API endpoints from a JS bundle, JSON body or inline state.
+    JSON is walked (phones only from phone-ish keys); anything else is scanned
+    for emails and numbers that follow tel:/phone/mobile/contact.
+    """
+    if isinstance(data, bytes):
+        data = data.decode(encoding or "utf-8", errors="replace")
+    store = ContactStore()
+    try:
+        _walk_json(json.loads(data), "", store, source)
+    except ValueError:
+        text = data.replace("\\u0040", "@").replace("\\/", "/")
+        for email in Patterns.EMAIL_STRICT.findall(text):
+            store.add_email(email, source)
+        for match in Patterns.SCRIPT_PHONE.finditer(text):
+            store.add_phone(match.group(1), source)
+    return {
+        "emails": store.emails,
+        "phones": store.phones,
+        "endpoints": list(dict.fromkeys(Patterns.API_ENDPOINT.findall(data))),
+    }
+
+
+def extract_spa_data(html: str, source: str = "") -> Dict:
+    """
+    Mine SPA state shipped in the server HTML (__NEXT_DATA__, __NUXT__, JSON-LD,
+    application/json blocks) with a regex scan of <script> tags, and list the
+    external bundles and API endpoints worth fetching next.
+    """
+    store = ContactStore()
+    scripts = []
+    for attrs, body in Patterns.SCRIPT_TAG.findall(html):
+        attr = {k.lower(): v for k, v in Patterns.SCRIPT_ATTR.findall(attrs)}
+        if attr.get("src"):
+            if attr["src"].split("?")[0].endswith(".js"):
+                scripts.append(attr["src"])
+            continue
+        if (
+            attr.get("id") == "__NEXT_DATA__"
+            or "json" in attr.get("type", "")
+            or any(marker in body for marker in SPA_STATE_MARKERS)
+        ):
+            found = mine_script(body, source)
+            store.update(found["emails"], found["phones"])
+    return {
+        "emails": store.emails,
+        "phones": store.phones,
+        "scripts": list(dict.fromkeys(scripts)),
+        "endpoints": list(dict.fromkeys(Patterns.API_ENDPOINT.findall(html))),
+    }
+
+
+class SpaStats:
+    """How many SPA sites were resolved without launching Selenium (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sites = 0
+        self.static = 0
+
+    def add(self, rendered: bool):
+        with self.lock:
+            self.sites += 1
+            self.static += not rendered
+
+    def summary(self) -> str:
+        ratio = self.static / self.sites if self.sites else 0.0
+        return (
+            f"SPA sites: {self.sites}, resolved without Selenium: "
+            f"{self.static} ({ratio:.0%})"
+        )
+
+
+SPA_STATS = SpaStats()
+
+
+# ==============================
+# Fetch Retries & Circuit Breaker
+# ==============================
+# Error classes worth another try, and those that say the host itself is down.
+# "dns" (no such name) and "refused" (nothing listening) fail the same way every
+# time, so they are neither retried nor counted against the host's circuit.
+TRANSIENT_ERRORS = {"connection", "timeout", "http_429", "http_5xx"}
+HOST_ERRORS = {"connection", "timeout", "unreachable", "http_5xx"}
+
+
+def _socket_error(exc: BaseException) -> Optional[BaseException]:
+    """The socket error under a requests/urllib3/httpx wrapper chain, if any."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, (socket.gaierror, ConnectionRefusedError)):
+            return exc
+        reason = getattr(exc, "reason", None)  # urllib3 MaxRetryError
+        if isinstance(reason, BaseException):
+            exc = reason
+        elif exc.args and isinstance(exc.args[0], BaseException):  # requests wraps it in args
+            exc = exc.args[0]
+        else:
+            exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def classify_error(exc: Exception) -> str:
+    """Error class of a failed request, used for retries and FETCH_STATS."""
+    if isinstance(exc, requests.exceptions.SSLError):
+        return "ssl"
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return "unreachable"
+    if isinstance(exc, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        cause = _socket_error(exc)
+        if isinstance(cause, socket.gaierror):
+            return "dns"
+        if isinstance(cause, ConnectionRefusedError):
+            return "refused"
+        return "connection"
+    if isinstance(exc, requests.exceptions.ChunkedEncodingError):
+        return "connection"
+    if isinstance(exc, requests.exceptions.TooManyRedirects):
+        return "redirects"
+    return "invalid"  # bad URL / schema: retrying won't help
+
+
+def classify_status(status: int) -> Optional[str]:
+    """Error class of an HTTP status, None for a usable answer."""
+    if status == 429:
+        return "http_429"
+    if status >= 500:
+        return "http_5xx"
+    if status >= 400:
+        return "http_4xx"
     return None
 
 
+class RetryPolicy:
+    """
+    Which requests are retried and how long to wait in between: only GETs
+    (idempotent) failing with a TRANSIENT_ERRORS class, with full-jitter
+    exponential backoff; 429 honours a numeric Retry-After up to max_backoff.
+    """
+
+    def __init__(
+        self,
+        attempts: int = RETRY_ATTEMPTS,
+        backoff: float = RETRY_BACKOFF,
+        max_backoff: float = RETRY_MAX_BACKOFF,
+    ):
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit shared by every worker thread: after BREAKER_FAILURES
+    consecutive host failures requests to it fail fast for BREAKER_COOLDOWN
+    seconds, then a single trial request decides whether it closes again.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, List[float]] = {}  # host -> [consecutive failures, opened at]
+
+    def allow(self, host: str) -> bool:
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None or state[0] < self.failures:
+                return True
+            if time.monotonic() - state[1] < self.cooldown:
+                return False
+            state[1] = time.monotonic()  # half-open: let this one request through
+            return True
+
+    def success(self, host: str):
+        with self.lock:
+            self.hosts.pop(host, None)
+
+    def failure(self, host: str):
+        with self.lock:
+            state = self.hosts.setdefault(host, [0, 0.0])
+            state[0] += 1
+            if state[0] == self.failures:
+                log_error(f"Circuit opened for {host}")
+            if state[0] >= self.failures:
+                state[1] = time.monotonic()
+
+    def open_hosts(self) -> int:
+        with self.lock:
+            return sum(1 for n, _ in self.hosts.values() if n >= self.failures)
+
+
+class FetchStats:
+    """Requests, retries and failures per error class (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.bytes = 0  # body bytes on the wire (compressed)
+        self.errors: Dict[str, int] = {}
+
+    def request(self):
+        with self.lock:
+            self.requests += 1
+
+    def add_bytes(self, n: int):
+        with self.lock:
+            self.bytes += n
+
+    def error(self, kind: str, retried: bool):
+        with self.lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            self.retries += retried
+
+    def summary(self) -> str:
+        with self.lock:
+            errors = ", ".join(f"{k}={v}" for k, v in sorted(self.errors.items())) or "none"
+            return (
+                f"Fetches: {self.requests} requests, {self.bytes / 2**20:.1f} MB, "
+                f"{self.retries} retries; errors: {errors}"
+            )
+
+
+class FetchedPage:
+    """
+    The parts of a response the scraper reads, with the body already downloaded
+    (in FETCH_CHUNK pieces, so a cancel can stop it); both transports return it.
+    """
+
+    __slots__ = ("status_code", "reason", "headers", "url", "encoding", "content")
+
+    def __init__(self, status_code: int, reason: str, headers, url: str, content: bytes):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.url = url
+        self.encoding = requests.utils.get_encoding_from_headers(self.headers)
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        # like requests: the header charset, else a guess from the bytes
+        encoding = self.encoding or requests.compat.chardet.detect(self.content)["encoding"]
+        try:
+            return str(self.content, encoding or "utf-8", errors="replace")
+        except LookupError:
+            return str(self.content, "utf-8", errors="replace")
+
+
+class Http2Session:
+    """
+    Per-site HTTP/2 client over the optional httpx[http2] package: a site's
+    pages reuse one connection, gzip/deflate bodies are decoded
+    transparently, and answers come back as FetchedPage objects
+    (errors as requests exceptions) so the rest of the fetch layer is shared.
+    """
+
+    def __init__(self):
+        try:
+            import httpx
+        except ImportError:
+            raise RuntimeError("HTTP/2 needs httpx: pip install 'httpx[http2]'") from None
+        self.httpx = httpx
+        self.client = httpx.Client(http2=True, verify=False)
+
+    def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict],
+        timeout: float,
+        allow_redirects: bool,
+        check_cancel: Callable[[], None],
+    ) -> FetchedPage:
+        httpx = self.httpx
+        try:
+            with self.client.stream(
+                "GET", url, headers=headers, timeout=timeout, follow_redirects=allow_redirects
+            ) as r:
+                chunks = []
+                for chunk in r.iter_bytes(FETCH_CHUNK):
+                    check_cancel()
+                    chunks.append(chunk)
+                FETCH_STATS.add_bytes(r.num_bytes_downloaded)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TooManyRedirects as e:
+            raise requests.exceptions.TooManyRedirects(str(e)) from e
+        except (httpx.NetworkError, httpx.RemoteProtocolError, httpx.DecodingError) as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+        return FetchedPage(r.status_code, r.reason_phrase, r.headers, str(r.url), b"".join(chunks))
+
+    def close(self):
+        self.client.close()
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+RETRY_POLICY = RetryPolicy()
+BREAKER = CircuitBreaker()
+FETCH_STATS = FetchStats()
+
+
+# ==============================
+# Robots.txt
+# ==============================
+class RobotsPolicy:
+    """
+    robots.txt rules per origin (scheme://host), fetched once per run and,
+    with a SQLite file, kept for ROBOTS_TTL_HOURS so later runs don't refetch
+    them. slot() spaces requests to a host by its Crawl-delay (capped at
+    ROBOTS_MAX_DELAY) across all threads.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS robots (
+            origin TEXT PRIMARY KEY,
+            body TEXT NOT NULL,
+            fetched REAL NOT NULL
+        );
+    """
+
+    def __init__(self, ttl_hours: float = ROBOTS_TTL_HOURS):
+        self.enabled = True
+        self.ttl = ttl_hours * 3600
+        self.lock = threading.Lock()
+        self.rules: Dict[str, "urllib.robotparser.RobotFileParser"] = {}
+        self.fetching: Dict[str, threading.Lock] = {}
+        self.next_slot: Dict[str, float] = {}
+        self.conn = None
+        self.fetched = 0
+        self.cached = 0
+        self.blocked = 0
+
+    def open(self, path: str):
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def _load(self, origin: str) -> Optional[str]:
+        if self.conn is None:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, fetched FROM robots WHERE origin = ?", (origin,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return row[0]
+
+    def _store(self, origin: str, body: str):
+        if self.conn is None:
+            return
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO robots VALUES (?, ?, ?)", (origin, body, time.time())
+            )
+
+    def get(
+        self,
+        url: str,
+        fetch: Callable[[str], Optional[str]],
+        check_cancel: Optional[Callable[[], None]] = None,
+    ):
+        """
+        The RobotFileParser for url's origin. fetch(robots_url) returns the
+        body, "" when there is none (everything allowed) or None when it
+        couldn't be read, which allows everything for this run only.
+        While another thread fetches it, check_cancel() runs every CANCEL_POLL
+        seconds and may raise to stop waiting.
+        """
+        origin = self._origin(url)
+        with self.lock:
+            rules = self.rules.get(origin)
+            if rules is not None:
+                return rules
+            fetching = self.fetching.setdefault(origin, threading.Lock())
+        # one fetch per origin; other threads wait for it
+        while not fetching.acquire(timeout=CANCEL_POLL):
+            if check_cancel:
+                check_cancel()
+        try:
+            with self.lock:
+                rules = self.rules.get(origin)
+            if rules is not None:
+                return rules
+            body = self._load(origin)
+            if body is not None:
+                with self.lock:
+                    self.cached += 1
+            else:
+                body = fetch(f"{origin}/robots.txt")
+                with self.lock:
+                    self.fetched += 1
+                if body is not None:
+                    self._store(origin, body)
+            import urllib.robotparser
+
+            rules = urllib.robotparser.RobotFileParser()
+            rules.parse((body or "").splitlines())
+            with self.lock:
+                self.rules[origin] = rules
+                self.fetching.pop(origin, None)
+        finally:
+            fetching.release()
+        return rules
+
+    def allowed(
+        self,
+        url: str,
+        fetch: Callable[[str], Optional[str]],
+        check_cancel: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        if not self.enabled:
+            return True
+        if self.get(url, fetch, check_cancel).can_fetch(HEADERS["User-Agent"], url):
+            return True
+        with self.lock:
+            self.blocked += 1
+        return False
+
+    def slot(self, url: str) -> float:
+        """Seconds to wait before requesting url so its host's Crawl-delay is kept."""
+        if not self.enabled:
+            return 0.0
+        origin = self._origin(url)
+        with self.lock:
+            rules = self.rules.get(origin)
+            delay = rules.crawl_delay(HEADERS["User-Agent"]) if rules else None
+            if not delay:
+                return 0.0
+            now = time.monotonic()
+            start = max(now, self.next_slot.get(origin, 0.0))
+            self.next_slot[origin] = start + min(float(delay), ROBOTS_MAX_DELAY)
+            return start - now
+
+    def summary(self) -> str:
+        with self.lock:
+            return (
+                f"robots.txt: {self.fetched} fetched, {self.cached} from cache, "
+                f"{self.blocked} disallowed URLs skipped"
+            )
+
+
+ROBOTS = RobotsPolicy()
+
+
+# ==============================
+# Crawl Profiles
+# ==============================
+def load_profile(spec: str) -> Dict:
+    """
+    A built-in profile by name, or a JSON file overriding any of its keys
+    ("extends" picks the base, default DEFAULT_PROFILE).
+    """
+    if spec in CRAWL_PROFILES:
+        return CRAWL_PROFILES[spec]
+    with open(spec, "r", encoding="utf-8") as f:
+        custom = json.load(f)
+    if not isinstance(custom, dict) or not isinstance(custom.get("paths", []), list):
+        raise ValueError(f'{spec}: expected an object with a "paths" list')
+    base_name = custom.get("extends", DEFAULT_PROFILE)
+    if base_name not in CRAWL_PROFILES:
+        raise ValueError(f"{spec}: unknown base profile {base_name!r}")
+    base = CRAWL_PROFILES[base_name]
+    profile = dict(base, name=os.path.splitext(os.path.basename(spec))[0])
+    profile.update({k: v for k, v in custom.items() if k in base and k != "name"})
+    if "paths" in custom and "max_paths" not in custom:
+        profile["max_paths"] = len(profile["paths"])
+    return profile
+
+
+class PathStats:
+    """
+    Hit rates of the common paths and of followed link types ("link:contact"),
+    per profile and TLD (thread-safe). A hit is a probe that found a needed
+    contact the site didn't have yet. Each (profile, TLD) falls back to the
+    profile-wide counts until it has PATH_MIN_TRIES probes of its own. With a
+    SQLite file the counts carry over between runs (and workers: save() adds
+    this process's new counts to the file's).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS path_stats (
+            profile TEXT NOT NULL,
+            tld TEXT NOT NULL,
+            path TEXT NOT NULL,
+            tries INTEGER NOT NULL,
+            hits INTEGER NOT NULL,
+            PRIMARY KEY (profile, tld, path)
+        );
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tries: Dict[Tuple[str, str, str], int] = {}
+        self.hits: Dict[Tuple[str, str, str], int] = {}
+        self.pending: Dict[Tuple[str, str, str], List[int]] = {}  # not saved yet
+        self.sites = 0
+        self.conn = None
+        self.save_lock = threading.Lock()  # one writer of the file at a time
+
+    def open(self, path: str):
+        """Load the counts of earlier runs from a SQLite file and save to it."""
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        with self.lock:
+            for profile, tld, name, tries, hits in self.conn.execute("SELECT * FROM path_stats"):
+                key = (profile, tld, name)
+                self.tries[key] = self.tries.get(key, 0) + tries
+                self.hits[key] = self.hits.get(key, 0) + hits
+
+    def save(self):
+        with self.save_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            if self.conn is None or not pending:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO path_stats VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (profile, tld, path) DO UPDATE SET "
+                    "tries = tries + excluded.tries, hits = hits + excluded.hits",
+                    [(*key, tries, hits) for key, (tries, hits) in pending.items()],
+                )
+
+    def close(self):
+        self.save()
+        with self.save_lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def site_done(self):
+        """Count a crawled site; the new counts are saved every PATH_SAVE_EVERY sites."""
+        with self.lock:
+            self.sites += 1
+            due = self.sites % PATH_SAVE_EVERY == 0
+        if due:
+            self.save()
+
+    def record(self, profile: str, tld: str, path: str, hit: bool):
+        with self.lock:
+            for key in ((profile, tld, path), (profile, "*", path)):
+                self.tries[key] = self.tries.get(key, 0) + 1
+                self.hits[key] = self.hits.get(key, 0) + hit
+                counts = self.pending.setdefault(key, [0, 0])
+                counts[0] += 1
+                counts[1] += hit
+
+    def _counts(self, profile: str, tld: str, path: str) -> Tuple[int, int]:
+        key = (profile, tld, path)
+        if self.tries.get(key, 0) < PATH_MIN_TRIES:
+            key = (profile, "*", path)
+        return self.tries.get(key, 0), self.hits.get(key, 0)
+
+    def rate(self, profile: str, tld: str, path: str) -> float:
+        tries, hits = self._counts(profile, tld, path)
+        # Laplace prior: untried paths sit at 0.5 until they prove otherwise
+        return (hits + 1) / (tries + 2)
+
+    def pruned(self, profile: str, tld: str, path: str) -> bool:
+        """
+        True for a path that has had PATH_MIN_TRIES probes and hardly ever
+        hits; a PATH_EXPLORE share of its probes still go out so that a path
+        that starts paying off is noticed.
+        """
+        tries, hits = self._counts(profile, tld, path)
+        return (
+            tries >= PATH_MIN_TRIES
+            and hits / tries < PATH_PRUNE_RATE
+            and random.random() >= PATH_EXPLORE
+        )
+
+    def plan(self, profile: str, tld: str, paths: List[str]) -> List[str]:
+        """paths best hit rate first, without the pruned ones; ties keep their order."""
+        with self.lock:
+            kept = [path for path in paths if not self.pruned(profile, tld, path)]
+            return sorted(kept, key=lambda path: -self.rate(profile, tld, path))
+
+    def summary(self) -> str:
+        with self.lock:
+            rows = sorted(
+                ((key, n) for key, n in self.tries.items() if key[1] == "*"),
+                key=lambda kv: -self.hits[kv[0]] / kv[1],
+            )
+            hits = sum(self.hits[key] for key, _ in rows)
+            best = ", ".join(f"{key[2]} {self.hits[key]}/{n}" for key, n in rows[:5])
+            return f"Path hits: {hits}/{sum(n for _, n in rows)} probes; best: {best}"
+
+
+PATH_STATS = PathStats()
+
+
 # ==============================
 # Core Scraper Module
 # ==============================
+class ScrapeCancelled(Exception):
+    """Raised inside a scrape once its batch's cancel Event is set."""
+
+
 class ContactScraper:
-    def __init__(self, url: str, use_headless: bool = True):
+    # Hundreds of these are alive at once in big batches: no per-instance
+    # __dict__, and the page body is dropped as soon as run() is done with it
+    __slots__ = (
+        "url",
+        "extractor",
+        "need",
+        "content",
+        "is_react",
+        "is_vue",
+        "has_sitemap",
+        "captcha_detected",
+        "contacts",
+        "about_pages",
+        "headless",
+        "allow_redirects",
+        "seen_links",
+        "spa_mined",
+        "rendered",
+        "root_domain",
+        "cancel",
+        "fetched",
+        "session",
+        "profile",
+        "links_followed",
+        "transport",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        use_headless: bool = True,
+        extractor: Optional[Executor] = None,
+        need: Tuple[str, ...] = ("emails", "phones"),
+        cancel: Optional[threading.Event] = None,
+        profile: Optional[Dict] = None,
+        transport: Optional[str] = None,
+    ):
         self.url = url.rstrip("/")
+        # Optional ProcessPoolExecutor shared across sites: parsing runs there
+        # while this (I/O) thread only fetches
+        self.extractor = extractor
+        # Fields still missing; e.g. ("emails",) when Maps already showed the phone
+        self.need = need
         self.content = ""
         self.is_react = False
+        self.is_vue = False
         self.has_sitemap = False
         self.captcha_detected = False
-        self.emails: Set[str] = set()
-        self.phones: Set[str] = set()
+        self.contacts = ContactStore()
         self.about_pages: List[str] = []
-        self.options = Options()
+        self.headless = use_headless
         self.allow_redirects = True
-        self.seen_links = []
-        self.html_content = None
+        self.seen_links: Set[str] = set()
+        self.spa_mined = False
+        self.rendered = False
         self.root_domain = self._get_root_domain(self.url)
-        if use_headless:
-            self.options.add_argument("--headless")
+        # Set by scrape_many() on stop: checked before every fetch and between
+        # body chunks, so a cancelled site stops within one chunk read
+        self.cancel = cancel
+        self.fetched = False  # homepage answered; only then is the result worth caching
+        # One connection pool per site: its 10-20 pages reuse the connection
+        self.session = None
+        self.transport = transport or HTTP_TRANSPORT  # "requests" or "http2"
+        self.profile = profile or CRAWL_PROFILES[DEFAULT_PROFILE]  # see load_profile
+        self.links_followed = 0  # against the profile's max_links
+
+    @property
+    def emails(self) -> Dict[str, str]:
+        return self.contacts.emails
+
+    @property
+    def phones(self) -> Dict[str, str]:
+        return self.contacts.phones
 
     def _get_root_domain(self, url: str) -> str:
-        """Extract the root domain (e.g., example.edu.np) from URL."""
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        # For .edu.np, include the college name as root
-        parts = domain.split(".")
-        if len(parts) >= 3 and parts[-2] == "edu" and parts[-1] == "np":
-            return ".".join(parts[-3:])
-        # Fallback for other domains (e.g., example.com)
-        if len(parts) >= 2:
-            return ".".join(parts[-2:])
-        return domain
+        return get_root_domain(url)
 
     def fetch_page(self) -> bool:
+        if not self.allowed(self.url):
+            log_error(f"robots.txt disallows {self.url}")
+            return False
         try:
-            response = requests.get(
-                self.url,
-                headers=HEADERS,
-                timeout=5,
-                allow_redirects=self.allow_redirects,
-                verify=False,
-            )
-            if response.status_code // 100 in [4, 5]:
+            response = self._request(self.url)
+            # 429/5xx were already retried; another header set only helps a 4xx block
+            if classify_status(response.status_code) == "http_4xx":
                 headers = ALT_HEADERS
-                response = requests.get(
-                    self.url,
-                    headers=headers,
-                    timeout=5,
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                )
+                response = self._request(self.url, headers)
             if response.status_code != 200:
                 log_error(f"{self.url} returned {response.status_code}")
                 # return False
             self.content = response.text
-            self.is_react = any(ind in self.content for ind in REACT_INDICATORS)
-            self.is_vue = self.is_vue_page(self.content)
-            if self.is_vue:
-                log_info("Vue.js detected → will use Selenium")
-                self.is_react = False  # Vue wins over generic React checks
-            else:
-                self.is_react = any(ind in self.content for ind in REACT_INDICATORS)
+            framework, score = classify_spa(self.content)
+            self.is_vue = framework == "vue"
+            self.is_react = framework == "react"
+            if framework:
+                log_info(f"{framework} SPA detected (score {score:g}) → may need Selenium")
             # self.captcha_detected = "captcha" in self.content.lower()
             if self.captcha_detected:
                 log_error("CAPTCHA detected. Skipping content scraping.")
                 return False
-            self._check_sitemap()
             return True
         except requests.RequestException as e:
             log_error(f"Failed to fetch {self.url}: {e}")
             return False
 
     def fetch_common_paths(self):
-        for edu_path in EDU_PATHS:
+        """
+        Probe the profile's paths, best hit rate for this TLD first and
+        without the pruned ones, until the site is resolved or max_paths
+        probes are spent.
+        """
+        name, tld = self.profile["name"], get_tld(self.root_domain)
+        paths = PATH_STATS.plan(name, tld, self.profile["paths"])
+        paths = [path for path in paths if self.allowed(f"{self.url}{path}")]
+        for edu_path in paths[: self.profile["max_paths"]]:
+            if self._resolved():
+                break
+            found = self._found()
             try:
-                response = requests.get(
-                    f"{self.url}{edu_path}",
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                    timeout=3,
-                )
+                response = self._request(f"{self.url}{edu_path}", None, timeout=3)
                 log_info(f"Checking {self.url}{edu_path}")
                 if response.status_code != 200:
                     log_error(f"{self.url} returned {response.status_code}")
+                    PATH_STATS.record(name, tld, edu_path, False)
                     continue
-                self.extract_from_text(response.text)
-                self.handle_hyperlinks(response.text)
-            except requests.RequestException:
-                log_error(f"Failed to fetch {self.url}: e")
+                links = self.extract_from_text(
+                    response.content, f"{self.url}{edu_path}", response.encoding
+                )
+                PATH_STATS.record(name, tld, edu_path, self._found() > found)
+                self.handle_hyperlinks(links)
+            except requests.RequestException as e:
+                log_error(f"Failed to fetch {self.url}{edu_path}: {e}")
+                PATH_STATS.record(name, tld, edu_path, False)
 
     def _check_sitemap(self):
         sitemap_urls = [f"{self.url}/sitemap.xml", f"{self.url}/sitemap"]
         try:
             for sm_url in sitemap_urls:
-                res = requests.get(
-                    sm_url,
-                    headers=HEADERS,
-                    timeout=5,
-                    allow_redirects=self.allow_redirects,
-                    verify=False,
-                )
-                if res.status_code // 100 in [4, 5]:
-                    res = requests.get(
-                        self.url,
-                        headers=ALT_HEADERS,
-                        timeout=5,
-                        allow_redirects=self.allow_redirects,
-                        verify=False,
-                    )
+                if not self.allowed(sm_url):
+                    continue
+                res = self._request(sm_url)
+                if res.status_code == 403:  # bot filter: try the other User-Agent
+                    res = self._request(sm_url, ALT_HEADERS)
                 if res.status_code // 100 == 2:
                     self.has_sitemap = True
                     ###
@@ -367,246 +1573,357 @@ class ContactScraper:
         target_root = self._get_root_domain(url)
         return target_root == self.root_domain
 
-    def extract_from_html(self, html: str):
-        parser = BeautifulSoup(html, "html.parser")
-        for email in Patterns.EMAIL.findall(html):
-            self.emails.add(email.lower())
-        # Phones
-        # for match in Patterns.PHONE_NP.finditer(html):
-        #     if norm := normalize_phone(match.group()):
-        #         self.phones.add(norm)
-
-    def extract_from_contact_sections(self, html: str) -> set:
-        soup = BeautifulSoup(html, "html.parser")
-        phones = set()
-        # 1. Find <div>, <section>, <p> with contact keywords
-        for tag in soup.find_all(["div", "section", "p", "li", "span", "footer", "a"]):
-            text = tag.get_text().lower()
-            if any(kw in text for kw in CONTACT_KEYWORDS):
-                # Extract phones ONLY from this tag
-                for match in Patterns.PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.NEW_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.NEW_NEW_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.OTHER_PHONE_NP.finditer(tag.get_text()):
-                    norm = normalize_phone(match.group())
-                    if norm:
-                        self.phones.add(norm)
-
-                for match in Patterns.EMAIL.finditer(tag.get_text()):
-                    norm = match.group()
-                    self.emails.add(norm)
-
-                for match in Patterns.EMAIL_STRICT.finditer(tag.get_text()):
-                    norm = match.group()
-                    self.emails.add(norm)
-
-        # 2. Bonus: Footer is gold
-        footer = soup.find("footer")
-        if footer:
-            for match in Patterns.PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.NEW_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.NEW_NEW_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.OTHER_PHONE_NP.finditer(footer.get_text()):
-                norm = normalize_phone(match.group())
-                if norm:
-                    self.phones.add(norm)
-            for match in Patterns.EMAIL.finditer(footer.get_text()):
-                norm = match.group()
-                self.emails.add(norm)
-            for match in Patterns.EMAIL_STRICT.finditer(footer.get_text()):
-                norm = match.group()
-                self.emails.add(norm)
+    def _extract(self, func, *args) -> Dict:
+        """Run a CPU-stage extraction function in the extractor pool, if any."""
+        if self.extractor is not None:
+            try:
+                return self.extractor.submit(func, *args).result()
+            except BrokenExecutor as e:
+                log_error(f"Extraction pool unavailable, parsing in-thread: {e}")
+                self.extractor = None
+        return func(*args)
 
-        if DEBUGGER == True:
-            print(self.emails)
-            print(self.phones)
-            pdb.set_trace()
+    def _see(self, url: str) -> bool:
+        """Remember a link; False if already seen or MAX_SEEN_LINKS is reached."""
+        if url in self.seen_links or len(self.seen_links) >= MAX_SEEN_LINKS:
+            return False
+        self.seen_links.add(url)
+        return True
 
-        return phones
-
-    def extract_from_text(self, text: str):
-        # Emails
-        for email in Patterns.EMAIL.findall(text):
-            self.emails.add(email.lower())
-        # Extract mailto: links
-        soup = BeautifulSoup(text, "html.parser")
-        # 1. Find <div>, <section>, <p> with contact keywords
-        links = soup("a")
-        if links is not None:
-            for link in links:
-                if "href" in list(link.attrs.keys()):
-                    href = str(link["href"])
-                    if href.startswith("mailto:"):
-                        email = href[7:].split("?")[0]
-                        if Patterns.EMAIL.match(email):
-                            self.emails.add(email.lower())
-                    elif href.startswith("tel:"):
-                        phone = href[4:]
-                        if bool(Patterns.PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.NEW_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.NEW_NEW_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
-                        elif bool(Patterns.OTHER_PHONE_NP.search(phone.strip())):
-                            self.phones.add(phone)
+    def release(self):
+        """Drop the page body, link state and connections once the result is built."""
+        self.content = ""
+        self.about_pages = []
+        self.seen_links = set()
+        if self.session is not None:
+            self.session.close()
+            self.session = None
 
-        # Phones
-        # for match in Patterns.PHONE_NP.finditer(text):
-        # if norm := normalize_phone(match.group()):
-        # self.phones.add(norm)
-        smart_phones = self.extract_from_contact_sections(text)
-        self.phones.update(smart_phones)
+    def _resolved(self) -> bool:
+        minimum = {"emails": MIN_EMAILS, "phones": MIN_PHONES}
+        return all(len(getattr(self, field)) >= minimum[field] for field in self.need)
 
-    def scrape_static(self):
-        if not self.content:
-            return
-        self.extract_from_text(self.content)
-        self.handle_hyperlinks(self.content)
-        if self.has_sitemap:
-            for page in self.about_pages:  # limit to avoid spam
-                try:
-                    res = requests.get(
-                        page,
-                        headers=HEADERS,
-                        timeout=5,
-                        allow_redirects=self.allow_redirects,
-                        verify=False,
-                    )
-                    if res.status_code == 200:
-                        self.extract_from_text(res.text)
-                        # self.phones.update(self.extract_from_contact_sections(res.text))
-                except:
+    def _found(self) -> int:
+        """Contacts known for the fields still needed, to tell which probes pay off."""
+        return sum(len(getattr(self, field)) for field in self.need)
+
+    def allowed(self, url: str) -> bool:
+        """robots.txt lets us fetch url (its rules are fetched on first use)."""
+        return ROBOTS.allowed(url, self._fetch_robots, self._check_cancel)
+
+    def _fetch_robots(self, robots_url: str) -> Optional[str]:
+        try:
+            res = self._request(robots_url, timeout=3)
+        except requests.RequestException:
+            return None
+        if res.status_code == 200:
+            return res.text
+        # 4xx: no rules, everything allowed; 5xx: unknown, retried next run
+        return "" if res.status_code // 100 == 4 else None
+
+    def _check_cancel(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise ScrapeCancelled(self.url)
+
+    def _wait(self, seconds: float):
+        """time.sleep() that wakes up (and raises) as soon as the batch is cancelled"""
+        if self.cancel is None:
+            time.sleep(seconds)
+        elif self.cancel.wait(seconds):
+            raise ScrapeCancelled(self.url)
+
+    def _request(
+        self, url: str, headers: Optional[Dict] = HEADERS, timeout: float = 5
+    ) -> FetchedPage:
+        """
+        GET through RETRY_POLICY and the per-host BREAKER. The body is read in
+        FETCH_CHUNK pieces; a cancel between chunks closes the connection and
+        raises ScrapeCancelled. 4xx/5xx responses are returned once retries
+        are used up, network errors are raised.
+        """
+        host = urlparse(url).netloc.lower()
+        policy = RETRY_POLICY
+        for attempt in range(policy.attempts):
+            self._check_cancel()
+            delay = ROBOTS.slot(url)  # the host's Crawl-delay
+            if delay:
+                self._wait(delay)
+            last = attempt == policy.attempts - 1
+            if not BREAKER.allow(host):
+                FETCH_STATS.error("circuit_open", False)
+                raise requests.ConnectionError(f"Circuit open for {host}")
+            FETCH_STATS.request()
+            try:
+                res = self._get_body(url, headers, timeout)
+            except requests.RequestException as e:
+                kind = classify_error(e)
+                if kind in HOST_ERRORS:
+                    BREAKER.failure(host)
+                retry = kind in TRANSIENT_ERRORS and not last
+                FETCH_STATS.error(kind, retry)
+                if not retry:
+                    raise
+                self._wait(policy.delay(attempt))
+                continue
+            kind = classify_status(res.status_code)
+            if kind in HOST_ERRORS:
+                BREAKER.failure(host)
+            else:
+                BREAKER.success(host)
+            if kind is None:
+                return res
+            retry = kind in TRANSIENT_ERRORS and not last
+            FETCH_STATS.error(kind, retry)
+            if not retry:
+                return res
+            self._wait(policy.delay(attempt, res.headers.get("Retry-After")))
+        return res
+
+    def _get_body(self, url: str, headers: Optional[Dict], timeout: float) -> FetchedPage:
+        if self.session is None:
+            self.session = Http2Session() if self.transport == "http2" else requests.Session()
+        if isinstance(self.session, Http2Session):
+            return self.session.fetch(url, headers, timeout, self.allow_redirects, self._check_cancel)
+        res = self.session.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=self.allow_redirects,
+            verify=False,
+            stream=True,
+        )
+        with res:
+            chunks = []
+            for chunk in res.iter_content(FETCH_CHUNK):
+                self._check_cancel()
+                chunks.append(chunk)
+            FETCH_STATS.add_bytes(res.raw.tell())
+        return FetchedPage(res.status_code, res.reason, res.headers, res.url, b"".join(chunks))
+
+    def _get(self, url: str, timeout: int = 5) -> Optional[FetchedPage]:
+        try:
+            res = self._request(url, timeout=timeout)
+            return res if res.status_code == 200 else None
+        except requests.RequestException:
+            return None
+
+    def extract_from_html(self, html: str, source: str = ""):
+        for email in Patterns.EMAIL.findall(html):
+            self.contacts.add_email(email, source)
+        # Phones
+        # for match in Patterns.PHONE_NP.finditer(html):
+        #     self.contacts.add_phone(match.group(), source)
+
+    def extract_from_contact_sections(self, html: str, source: str = "") -> set:
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        return _extract_contact_sections(soup, self.contacts, source or self.url)
+
+    def extract_from_text(self, text, source: str = "", encoding: Optional[str] = None) -> List[str]:
+        """Merge a page's contacts into self.contacts; returns the links found on it"""
+        source = source or self.url
+        page = self._extract(extract_contacts, text, source, encoding)
+        self.contacts.update(page["emails"], page["phones"])
+
+        if DEBUGGER == True:
+            print(self.emails)
+            print(self.phones)
+            import pdb
+
+            pdb.set_trace()
+
+        return page["links"]
+
+    def scrape_static(self):
+        if not self.content:
+            return
+        # here rather than in fetch_page: a site resolved by scrape_structured() skips it
+        self._check_sitemap()
+        links = self.extract_from_text(self.content)
+        self.handle_hyperlinks(links)
+        if self.has_sitemap:
+            for page in self.about_pages:  # limit to avoid spam
+                if self._resolved():
+                    break
+                if not self.allowed(page):
+                    continue
+                try:
+                    res = self._request(page)
+                    if res.status_code == 200:
+                        self.extract_from_text(res.content, page, res.encoding)
+                except requests.RequestException as e:
+                    log_error(f"Failed to fetch {page}: {e}")
+
+    def scrape_structured(self) -> bool:
+        """
+        Structured-data fast path over the homepage (JSON-LD, microdata, vCards).
+        Returns True when it alone satisfies MIN_EMAILS/MIN_PHONES.
+        """
+        page = self._extract(extract_structured_data, self.content, self.url)
+        self.contacts.update(page["emails"], page["phones"])
+        for href in page["vcards"][:SPA_FETCH_LIMIT]:
+            if self._resolved():
+                break
+            url = urllib.parse.urljoin(f"{self.url}/", href)
+            if not self.allowed(url):
+                continue
+            res = self._get(url)
+            if res is not None:
+                found = self._extract(parse_vcard, res.content, url, res.encoding)
+                self.contacts.update(found["emails"], found["phones"])
+        return self._resolved()
+
+    def revalidate(self, pages: List[str]) -> Optional[Dict]:
+        """
+        Refetch only the pages a cached result's contacts were found on.
+        Returns the refreshed result, or None when they no longer satisfy
+        MIN_EMAILS/MIN_PHONES and the site needs a full scrape.
+        """
+        log_info(f"Revalidating: {self.url} ({len(pages)} pages)")
+        try:
+            for page in pages:
+                if not self.allowed(page):
                     continue
+                res = self._get(page)
+                if res is not None:
+                    self.fetched = True
+                    self.extract_from_text(res.content, page, res.encoding)
+            if not self._resolved():
+                self.fetched = False
+                return None
+            return self._result()
+        finally:
+            self.release()
+
+    def scrape_spa_static(self) -> bool:
+        """
+        Try to get SPA contacts without a browser: inline state/JSON-LD first,
+        then same-site JS bundles and the JSON endpoints they reference.
+        Returns True once both emails and phones are known.
+        """
+        if self.spa_mined:
+            return self._resolved()
+        self.spa_mined = True
+        page = self._extract(extract_spa_data, self.content, self.url)
+        self.contacts.update(page["emails"], page["phones"])
+
+        base = f"{self.url}/"
+        scripts = [urllib.parse.urljoin(base, src) for src in page["scripts"]]
+        endpoints = [urllib.parse.urljoin(base, ep) for ep in page["endpoints"]]
+        fetched = 0
+        for kind, urls in (("bundle", scripts), ("endpoint", endpoints)):
+            for url in urls:
+                if self._resolved() or fetched >= SPA_FETCH_LIMIT:
+                    break
+                if not self._is_same_root_domain(url) or not self._see(url):
+                    continue
+                if not self.allowed(url):
+                    continue
+                fetched += 1
+                res = self._get(url)
+                if res is None:
+                    continue
+                log_debug(f"Mining SPA {kind} {url}")
+                found = self._extract(mine_script, res.content, url, res.encoding)
+                self.contacts.update(found["emails"], found["phones"])
+                if kind == "bundle":  # bundles reveal the XHR endpoints
+                    endpoints.extend(urllib.parse.urljoin(base, ep) for ep in found["endpoints"])
+        return self._resolved()
 
     def scrape_dynamic(self, url, forced=False):
-        if forced:
-            driver = None
-            try:
-                driver = webdriver.Firefox(options=self.options)
-                driver.get(url)
-                time.sleep(5)
-                # body_text = driver.find_element(By.TAG_NAME, "body").text
-                html_content = driver.page_source
-                self.extract_from_text(html_content)
-                self.handle_hyperlinks(html_content)
-                # Extract mailto: links
-                links = driver.find_elements(By.TAG_NAME, "a")
-                for link in links:
-                    href = link.get_attribute("href") or ""
-                    if href.startswith("mailto:"):
-                        email = href[7:].split("?")[0]
-                        if Patterns.EMAIL.match(email):
-                            self.emails.add(email.lower())
-            except Exception as e:
-                log_error(f"Selenium failed for {url}: {e}")
-            finally:
-                if driver:
-                    driver.quit()
-        if not (self.is_vue or self.is_react):
+        if not (forced or self.is_vue or self.is_react):
+            return
+        if self.rendered:  # one browser launch per site is enough
             return
+        self.rendered = True
+        from selenium.webdriver.common.by import By
+
         driver = None
         try:
-            driver = webdriver.Firefox(options=self.options)
+            self._check_cancel()
+            driver = webdriver.Firefox(options=firefox_options(self.headless))
+            DRIVERS.add(self.cancel, driver)
+            self._check_cancel()  # cancelled while Firefox started: not registered in time
+            driver.set_page_load_timeout(RENDER_TIMEOUT)
             driver.get(url)
-            time.sleep(5)
+            self._wait(5)
             # body_text = driver.find_element(By.TAG_NAME, "body").text
             html_content = driver.page_source
-            self.extract_from_text(html_content)
-            self.handle_hyperlinks(html_content)
+            links = self.extract_from_text(html_content, url)
+            self.handle_hyperlinks(links)
             # Extract mailto: links
             links = driver.find_elements(By.TAG_NAME, "a")
             for link in links:
                 href = link.get_attribute("href") or ""
                 if href.startswith("mailto:"):
-                    email = href[7:].split("?")[0]
-                    if Patterns.EMAIL.match(email):
-                        self.emails.add(email.lower())
+                    email = urllib.parse.unquote(href[7:].split("?")[0])
+                    self.contacts.add_email(email, url)
+        except ScrapeCancelled:
+            raise
         except Exception as e:
+            self._check_cancel()  # a cancel quit the browser under us
             log_error(f"Selenium failed for {url}: {e}")
         finally:
             if driver:
-                driver.quit()
+                DRIVERS.discard(self.cancel, driver)
+                try:
+                    driver.quit()
+                except Exception:
+                    pass  # already quit by a cancel
 
-    def handle_hyperlinks(self, html: str):
+    def handle_hyperlinks(self, links: List[str]):
         """
         Hyperlinks like "Contact Us", "About Us" etc. may exist,
-        despite the site not having sitemap.xml
+        despite the site not having sitemap.xml. A link's type is its
+        heaviest link_keywords match ("link:contact"); types are followed in
+        PATH_STATS order (pruned ones not at all), then by keyword score,
+        within the profile's max_links.
         """
-        parser = BeautifulSoup(html, "html.parser")
-        links = parser("a")
-        if links is not None:
-            for link in links:
-                if "href" in list(link.attrs.keys()):
-                    href = str(link["href"])
-                    if href not in self.seen_links and (
-                        href.startswith("https") or href.startswith("http")
-                    ):
-                        if self._is_same_root_domain(href):
-                            self.seen_links.append(href)
-                            keywords = ["about", "contact"]
-                            for k in keywords:
-                                if k in href.lower():
-                                    log_debug(f"Found {k} Hyperlink at {href}")
-                                    res = requests.get(
-                                        f"{href}",
-                                        allow_redirects=self.allow_redirects,
-                                        verify=False,
-                                        timeout=5,
-                                    )
-                                    if res.status_code == 200:
-                                        self.extract_from_text(res.text)
-                                    else:
-                                        log_error(f"{href} returned {res.status_code}")
+        keywords = self.profile["link_keywords"]
+        name, tld = self.profile["name"], get_tld(self.root_domain)
+        by_type: Dict[str, List[Tuple[int, str]]] = {}
+        for href in links:
+            matched = [k for k in keywords if k in href.lower()]
+            if (
+                matched
+                and self._is_same_root_domain(href)
+                and self._see(href)
+                and self.allowed(href)
+            ):
+                kind = "link:" + max(matched, key=keywords.get)
+                score = sum(keywords[k] for k in matched)
+                by_type.setdefault(kind, []).append((score, href))
+        kinds = sorted(by_type, key=lambda kind: -keywords[kind[len("link:") :]])
+        scored = []
+        for kind in PATH_STATS.plan(name, tld, kinds):
+            ranked = sorted(by_type[kind], key=lambda item: -item[0])
+            scored.extend((kind, score, href) for score, href in ranked)
+        for kind, score, href in scored:
+            if self._resolved() or self.links_followed >= self.profile["max_links"]:
+                break
+            self.links_followed += 1
+            log_debug(f"Following {href} ({kind}, score {score})")
+            found = self._found()
+            try:
+                res = self._request(f"{href}", None)
+            except requests.RequestException as e:
+                log_error(f"Failed to fetch {href}: {e}")
+                PATH_STATS.record(name, tld, kind, False)
+                continue
+            if res.status_code == 200:
+                self.extract_from_text(res.content, href, res.encoding)
+            else:
+                log_error(f"{href} returned {res.status_code}")
+            PATH_STATS.record(name, tld, kind, self._found() > found)
 
     def is_vue_page(self, html: str) -> bool:
-        """Return True if Vue 2 or Vue 3 is detected"""
-        checks = [
-            # Vue 2 fingerprints
-            r"__vue__",
-            r"data-v-",
-            r"_v-",
-            r"vue\.min\.js",
-            r"vue\.global\.prod\.js",
-            # Vue 3 fingerprints
-            r"__vue_app__",
-            r"__VUE__",
-            r"@vue/runtime-core",
-            r"runtime-dom",
-            # Common
-            r"Vue\.config",
-            r"vue-devtools",
-            r'id="app"',
-        ]
-        return any(re.search(pattern, html, re.IGNORECASE) for pattern in checks)
+        """Return True if a client-rendered Vue 2 or Vue 3 page is detected"""
+        return classify_spa(html)[0] == "vue"
 
     def clean_emails(self):
         gibberish = ["example", "yoursite", ".png", ".svg", ".jpg", ".jpeg", ".gif"]
-        for email in self.emails.copy():
-            for g in gibberish:
-                if g in email:
-                    self.emails.remove(email)
+        for email in list(self.emails):
+            if any(g in email for g in gibberish):
+                self.contacts.discard_email(email)
 
     def debug_phone_regex(self):
         for phone in self.phones:
@@ -619,19 +1936,45 @@ class ContactScraper:
             )
 
     def run(self) -> Dict:
+        try:
+            return self._run()
+        finally:
+            self.release()
+            PATH_STATS.site_done()
+
+    def _run(self) -> Dict:
         log_info(f"Scraping: {self.url}")
-        if not self.fetch_page():
-            return {"website": self.url, "emails": [], "numbers": []}
+        self.fetched = self.fetch_page()
+        if not self.fetched:
+            # keep anything seeded before run() (e.g. the phone shown on Maps)
+            return {
+                "website": self.url,
+                "emails": sorted(self.emails),
+                "numbers": sorted(self.phones),
+            }
+        if self.scrape_structured():
+            log_info(f"Structured data has the contacts, skipping crawl of {self.url}")
+            return self._result()
         self.scrape_static()
         if self.is_react or self.is_vue:
-            self.scrape_dynamic(self.url)
+            # Selenium only when the static SPA sources don't have the contacts
+            if self._resolved() or self.scrape_spa_static():
+                log_info(f"SPA contacts found without rendering {self.url}")
+            else:
+                self.scrape_dynamic(self.url)
+            SPA_STATS.add(rendered=self.rendered)
         self.fetch_common_paths()
-        if len(self.phones) == 0 or len(self.emails) == 0:
+        if not self._resolved() and not self.rendered:
             log_info(
                 "Static Scraping didn't return proper results\n\tTrying Dynamic Fetching"
             )
-            self.scrape_dynamic(self.url, forced=True)
+            # the bundle/endpoint sources only exist on React/Vue sites
+            if not ((self.is_react or self.is_vue) and self.scrape_spa_static()):
+                self.scrape_dynamic(self.url, forced=True)
+
+        return self._result()
 
+    def _result(self) -> Dict:
         self.clean_emails()
         self.debug_phone_regex()
 
@@ -645,12 +1988,97 @@ class ContactScraper:
 # ==============================
 # Google Maps URL Extractor
 # ==============================
+def _card_address(text: str) -> str:
+    """
+    Address part of a Maps result card, e.g. "School · Kirtipur, Kathmandu"
+    -> "Kirtipur, Kathmandu" (rating, opening hours and phone lines are skipped)
+    """
+    for line in text.splitlines()[1:]:
+        parts = [p.strip() for p in re.split(r"[·⋅]", line) if p.strip()]
+        if len(parts) < 2:
+            continue
+        for part in parts[1:]:
+            if re.search(r"\b(?:open|close[sd]?|hours)\b", part, re.IGNORECASE):
+                continue
+            if normalize_phone(part) or _add_phones(part, ContactStore(), ""):
+                continue
+            if re.fullmatch(r"[\d.,()\s★]+", part):  # ratings / review counts
+                continue
+            return part
+    return ""
+
+
+class DriverPool:
+    """Bounded pool of headless Firefox drivers reused across Maps queries."""
+
+    def __init__(self, size: int = MAPS_BROWSERS):
+        self.size = size
+        self.idle: queue.Queue = queue.Queue()
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, cancel: Optional[threading.Event] = None) -> Optional["webdriver.Firefox"]:
+        """An idle or new driver; None once cancel is set while waiting for one."""
+        while not (cancel is not None and cancel.is_set()):
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                create = self.created < self.size
+                if create:
+                    self.created += 1
+            if create:
+                try:
+                    return webdriver.Firefox(options=firefox_options())
+                except Exception:
+                    with self.lock:
+                        self.created -= 1
+                    raise
+            try:
+                # broken drivers free a slot without coming back: look again
+                return self.idle.get(timeout=CANCEL_POLL)
+            except queue.Empty:
+                continue
+        return None
+
+    def release(self, driver: "webdriver.Firefox", broken: bool = False):
+        if broken:
+            try:
+                driver.quit()
+            except Exception:
+                pass  # already gone (crashed, or quit by a cancel)
+            finally:
+                with self.lock:
+                    self.created -= 1
+            return
+        self.idle.put(driver)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().quit()
+            except queue.Empty:
+                break
+            except Exception:
+                continue
+
+
 class MapsScraper:
-    def __init__(self, keywords: str, limit: int = 4, inpfile=None):
+    def __init__(
+        self,
+        keywords: str,
+        limit: int = 4,
+        inpfile=None,
+        driver_pool: Optional[DriverPool] = None,
+        cancel: Optional[threading.Event] = None,
+    ):
         self.keywords = keywords
         self.limit = limit
         self.search_url = f"https://www.google.com/maps/search/{urllib.parse.quote_plus(keywords)}?hl=en"
         self.websites: Set[str] = set()
+        self.driver_pool = driver_pool
+        self.cancel = cancel  # stops scrolling (and frees the browser) when set
         self.inpfile = inpfile
         if self.inpfile:
             try:
@@ -661,30 +2089,110 @@ class MapsScraper:
             except FileNotFoundError:
                 log_error(f"{self.inpfile} not found")
 
-    def run(self) -> List[str]:
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _read_listings(self, driver) -> List[Dict]:
+        """Name, phone and website of every result card currently in the feed"""
+        from selenium.common.exceptions import WebDriverException
+        from selenium.webdriver.common.by import By
+
+        listings = []
+        for card in driver.find_elements(By.XPATH, MAPS_CARD_XPATH):
+            try:
+                place = card.find_element(By.XPATH, "./a[contains(@href, '/maps/place/')]")
+                links = card.find_elements(By.XPATH, ".//a[@data-value='Website']")
+                text = card.text
+                store = ContactStore()
+                _add_phones(text, store, "maps")
+                listings.append(
+                    {
+                        "name": place.get_attribute("aria-label") or "",
+                        "phone": next(iter(store.phones), ""),
+                        "website": (links[0].get_attribute("href") or "") if links else "",
+                        "address": _card_address(text),
+                        "place": place.get_attribute("href") or "",
+                        "query": self.keywords,
+                    }
+                )
+            except WebDriverException:  # card re-rendered while reading it
+                continue
+        if not listings:  # card markup changed: fall back to the bare website links
+            for el in driver.find_elements(By.XPATH, "//a[@data-value='Website']"):
+                listings.append(
+                    {
+                        "name": "",
+                        "phone": "",
+                        "website": el.get_attribute("href") or "",
+                        "address": "",
+                        "place": "",
+                        "query": self.keywords,
+                    }
+                )
+        return listings
+
+    def stream_listings(self, include_no_website: bool = False) -> Iterator[Dict]:
+        """
+        Yield {"name", "phone", "website", "address", "place", "query"} for each
+        new listing as soon as it appears in the results feed; listings without
+        a website are only yielded with include_no_website
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
         driver = None
+        broken = False
+        found = 0
+        if self._cancelled():  # queued before the stop
+            return
         try:
-            options = Options()
-            options.add_argument("--headless")
-            driver = webdriver.Firefox(options=options)
+            if self.driver_pool:
+                driver = self.driver_pool.acquire(self.cancel)
+            else:
+                driver = webdriver.Firefox(options=firefox_options())
+            if driver is None:
+                return
+            DRIVERS.add(self.cancel, driver)
+            if self._cancelled():  # stopped while Firefox started: not registered in time
+                return
             driver.get(self.search_url)
             driver.maximize_window()
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.XPATH, "//a[@data-value='Website']"))
+            website_link = EC.presence_of_element_located((By.XPATH, "//a[@data-value='Website']"))
+            WebDriverWait(driver, 20, poll_frequency=CANCEL_POLL).until(
+                lambda d: self._cancelled() or website_link(d)
             )
             feed = driver.find_element(By.XPATH, '//div[@role="feed"]')
             last_height = driver.execute_script("return arguments[0].scrollTop", feed)
-            while len(self.websites) < self.limit:
-                elements = driver.find_elements(By.XPATH, "//a[@data-value='Website']")
-                for el in elements:
-                    url = el.get_attribute("href")
-                    if url and url.startswith("http"):
+            while found < self.limit:
+                if self._cancelled():
+                    log_info(f"Maps search for '{self.keywords}' cancelled.")
+                    break
+                for listing in self._read_listings(driver):
+                    url = listing["website"]
+                    if not (url and url.startswith("http")):
+                        if not include_no_website:
+                            continue
+                        url = listing["place"] or listing["name"]
+                        listing["website"] = ""
+                    if url and url not in self.websites:
                         self.websites.add(url)
-                    if len(self.websites) >= self.limit:
+                        found += 1
+                        yield listing
+                    if found >= self.limit:
                         break
-                # Scroll
+                if found >= self.limit:
+                    break
+                # Scroll, then wait for new cards instead of a fixed sleep
+                cards = len(driver.find_elements(By.XPATH, MAPS_CARD_XPATH))
                 driver.execute_script("arguments[0].scrollTop += 600", feed)
-                time.sleep(3)
+                try:
+                    WebDriverWait(driver, 3, poll_frequency=0.25).until(
+                        lambda d: len(d.find_elements(By.XPATH, MAPS_CARD_XPATH)) > cards
+                    )
+                except TimeoutException:
+                    pass
                 new_height = driver.execute_script(
                     "return arguments[0].scrollTop", feed
                 )
@@ -692,42 +2200,910 @@ class MapsScraper:
                     log_info("No more results. End of scroll.")
                     break
                 last_height = new_height
-            log_info(f"Collected {len(self.websites)} websites from Maps.")
-            return list(self.websites)[: self.limit]
+            log_info(f"Collected {found} websites from Maps for '{self.keywords}'.")
         except TimeoutException:
             log_error("Website links not found in Google Maps.")
-            return []
         except Exception as e:
-            log_error(f"Maps scraping failed: {e}")
-            return []
+            broken = True
+            if not self._cancelled():
+                log_error(f"Maps scraping failed: {e}")
         finally:
             if driver:
-                driver.quit()
+                DRIVERS.discard(self.cancel, driver)
+                # a cancel may have quit it already
+                broken = broken or self._cancelled()
+            if driver and self.driver_pool:
+                self.driver_pool.release(driver, broken)
+            elif driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def stream(self) -> Iterator[str]:
+        """Yield each new website as soon as it appears in the results feed"""
+        for listing in self.stream_listings():
+            yield listing["website"]
+
+    def run(self) -> List[str]:
+        return list(self.stream())
+
+
+def stream_maps_batch(
+    queries: List[str],
+    limit: int = 4,
+    browsers: int = MAPS_BROWSERS,
+    include_no_website: bool = False,
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[Dict]:
+    """
+    Run many Maps queries concurrently over a bounded DriverPool and yield
+    listings as they arrive, deduplicated across queries by site_key
+    (by Maps place link for listings without a website).
+    """
+    queries = [q.strip() for q in queries if q.strip()]
+    pool = DriverPool(browsers)
+    out: queue.Queue = queue.Queue()
+    done = object()
+
+    def collect(query: str):
+        try:
+            if cancel is not None and cancel.is_set():
+                return
+            maps = MapsScraper(query, limit=limit, driver_pool=pool, cancel=cancel)
+            for listing in maps.stream_listings(include_no_website):
+                out.put(listing)
+        finally:
+            out.put(done)
+
+    seen: Set[str] = set()
+    executor = ThreadPoolExecutor(max_workers=browsers)
+    try:
+        for q in queries:
+            executor.submit(collect, q)
+        remaining = len(queries)
+        while remaining:
+            try:
+                listing = out.get(timeout=CANCEL_POLL)
+            except queue.Empty:
+                if cancel is not None and cancel.is_set():
+                    break
+                continue
+            if listing is done:
+                remaining -= 1
+                continue
+            if listing["website"]:
+                key = site_key(listing["website"])
+            else:
+                key = listing["place"] or listing["name"]
+            if key in seen:
+                continue
+            seen.add(key)
+            yield listing
+    finally:
+        # queries not started yet are dropped instead of opening Maps after a stop
+        executor.shutdown(wait=False, cancel_futures=True)
+        pool.close()
+
+
+def scrape_site(
+    url: str,
+    extractor: Optional[Executor] = None,
+    cancel: Optional[threading.Event] = None,
+    cache: Optional["ResultCache"] = None,
+    revalidate: bool = False,
+    need: Tuple[str, ...] = ("emails", "phones"),
+    seed_phone: str = "",
+    provenance: bool = False,
+    transport: Optional[str] = None,
+    profile: Optional[Dict] = None,
+) -> Dict:
+    """
+    Scrape one site through the result cache: fresh entries are returned as
+    they are, stale ones are revalidated (with revalidate=True) or rescraped.
+    With provenance the result also maps every value to the page it came from.
+    transport is "requests" or "http2" (default HTTP_TRANSPORT), profile a
+    crawl profile from load_profile (default DEFAULT_PROFILE).
+    """
+    entry = cache.get(url) if cache else None
+    if entry and entry["fresh"]:
+        log_info(f"Cached: {url}")
+        if provenance:
+            return dict(entry["result"], sources=entry["sources"])
+        return entry["result"]
+    scraper = ContactScraper(
+        url, extractor=extractor, need=need, cancel=cancel, profile=profile, transport=transport
+    )
+    if seed_phone:
+        scraper.contacts.add_phone(seed_phone, "maps")
+    result = None
+    if entry and revalidate and entry["pages"]:
+        result = scraper.revalidate(entry["pages"])
+    if result is None:
+        result = scraper.run()
+    # a need-limited scrape stops early and carries the Maps phone: not a full result
+    if cache and scraper.fetched and set(need) >= {"emails", "phones"}:
+        cache.put(url, result, scraper.emails, scraper.phones)
+    if provenance:
+        result = dict(result, sources={"emails": scraper.emails, "phones": scraper.phones})
+    return result
+
+
+def scrape_listing(
+    listing: Dict,
+    extractor: Optional[Executor] = None,
+    crawl: bool = True,
+    cancel: Optional[threading.Event] = None,
+    cache: Optional["ResultCache"] = None,
+    revalidate: bool = False,
+    provenance: bool = False,
+    transport: Optional[str] = None,
+    profile: Optional[Dict] = None,
+) -> Dict:
+    """
+    Complete a Maps listing: ContactScraper only runs for the fields Maps didn't
+    show (emails, and phones when the card had none); listings without a
+    website, or with crawl=False, are returned as they are.
+    """
+    row = {"name": listing["name"], "website": listing["website"]}
+    if not (listing["website"] and crawl):
+        row.update(emails="Not found", numbers=[listing["phone"]] if listing["phone"] else "Not found")
+    else:
+        need = ("emails",) if listing["phone"] else ("emails", "phones")
+        result = scrape_site(
+            listing["website"],
+            extractor,
+            cancel,
+            cache,
+            revalidate,
+            need,
+            listing["phone"],
+            provenance,
+            transport,
+            profile,
+        )
+        row.update(emails=result["emails"], numbers=result["numbers"])
+    row["address"] = listing["address"]
+    if provenance:
+        sources = result.get("sources") if listing["website"] and crawl else None
+        row["sources"] = sources or {"emails": {}, "phones": {listing["phone"]: "maps"} if listing["phone"] else {}}
+    return row
+
+
+# ==============================
+# Batch Engine
+# ==============================
+class ScrapeStats:
+    """
+    Counters of one scrape_many() batch, handed to its progress callback.
+    Each counter has a single writer (the feeder or the consuming thread).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.no_website = 0
+        self.emails_only = 0
+        self.not_crawled = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def in_flight(self) -> int:
+        return max(self.submitted - self.completed - self.failed, 0)
+
+    @property
+    def rate(self) -> float:
+        """Sites finished per second"""
+        elapsed = self.elapsed
+        return (self.completed + self.failed) / elapsed if elapsed else 0.0
+
+    def count_listing(self, listing: Dict, skip_known: bool):
+        if not listing["website"]:
+            self.no_website += 1
+        elif skip_known and listing["phone"]:
+            self.not_crawled += 1
+        elif listing["phone"]:
+            self.emails_only += 1
+
+    def summary(self) -> str:
+        text = (
+            f"{self.completed}/{self.submitted} sites in {self.elapsed:.1f}s "
+            f"({self.rate:.2f}/s), {self.failed} failed"
+        )
+        if self.duplicates:
+            text += f", {self.duplicates} duplicate scrapes saved"
+        if self.no_website or self.emails_only or self.not_crawled:
+            text += (
+                f"; listings: {self.no_website} without website, {self.not_crawled} not crawled,"
+                f" {self.emails_only} crawled for emails only"
+            )
+        return text
+
+
+def _scrape_item(
+    item,
+    extractor: Optional[Executor],
+    skip_known: bool,
+    cancel: threading.Event,
+    cache: Optional["ResultCache"],
+    revalidate: bool,
+    provenance: bool,
+    transport: Optional[str],
+    profile: Optional[Dict],
+) -> Dict:
+    if cancel.is_set():  # queued before the stop, picked up after it
+        raise ScrapeCancelled(str(item))
+    if isinstance(item, dict):
+        crawl = not (skip_known and item["phone"])
+        return scrape_listing(
+            item, extractor, crawl, cancel, cache, revalidate, provenance, transport, profile
+        )
+    return scrape_site(
+        item,
+        extractor,
+        cancel,
+        cache,
+        revalidate,
+        provenance=provenance,
+        transport=transport,
+        profile=profile,
+    )
+
+
+def scrape_many(
+    items: Iterable,
+    concurrency: int = 12,
+    extractor: Optional[Executor] = None,
+    deduper: Optional["SiteDeduper"] = None,
+    skip_known: bool = False,
+    progress: Optional[Callable[[ScrapeStats], None]] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    stats: Optional[ScrapeStats] = None,
+    cache: Optional["ResultCache"] = None,
+    revalidate: bool = False,
+    provenance: bool = False,
+    transport: Optional[str] = None,
+    profile: Optional[Dict] = None,
+) -> Iterator[Dict]:
+    """
+    Scrape URLs (or Maps listings, see scrape_listing) `concurrency` at a time
+    and yield each result as soon as it completes.
+
+    `items` may be a generator such as MapsScraper.stream_listings(); it is
+    consumed in a feeder thread, so sites are scraped while Maps still scrolls.
+    progress(stats) runs after every finished site and on_error(site, exc) for
+    every failed one, both in the consuming thread. Setting `cancel` (or closing
+    the iterator) returns within CANCEL_POLL seconds: queued sites are dropped
+    and in-flight ones abort at their next fetch or body chunk. Closing it
+    early sets `cancel`; a batch that runs to the end leaves it unset, so the
+    same Event can start the next batch.
+    Pass `stats` to read the batch counters afterwards, and `cache` to skip
+    sites scraped within its TTL (see ResultCache). With provenance every
+    result carries "sources": {"emails"/"phones": {value: page}}. transport
+    picks the fetch client per batch ("requests" or "http2", see Http2Session)
+    and profile the crawl profile (see load_profile).
+    """
+    stats = stats if stats is not None else ScrapeStats()
+    cancel = cancel or threading.Event()
+    finished: queue.Queue = queue.Queue()
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    def feed():
+        try:
+            for item in items:
+                if cancel.is_set():
+                    break
+                site = item["website"] if isinstance(item, dict) else item.strip()
+                if not (site or isinstance(item, dict)):
+                    continue
+                if site and deduper and not deduper.admit(site):
+                    stats.duplicates += 1
+                    continue
+                if isinstance(item, dict):
+                    stats.count_listing(item, skip_known)
+                else:
+                    item = site
+                try:
+                    future = pool.submit(
+                        _scrape_item,
+                        item,
+                        extractor,
+                        skip_known,
+                        cancel,
+                        cache,
+                        revalidate,
+                        provenance,
+                        transport,
+                        profile,
+                    )
+                except RuntimeError:  # pool shut down by a cancel
+                    break
+                stats.submitted += 1
+                future.add_done_callback(lambda f, site=site: finished.put((site, f)))
+        except Exception as e:
+            log_error(f"Feeding sites failed: {e}")
+        finally:
+            close = getattr(items, "close", None)
+            if close:  # e.g. a Maps stream stopped early: quits its browser now
+                close()
+            finished.put(None)  # nothing more will be submitted
+
+    threading.Thread(target=feed, daemon=True).start()
+    fed = drained = False
+    try:
+        while not (fed and stats.completed + stats.failed >= stats.submitted):
+            try:
+                entry = finished.get(timeout=CANCEL_POLL)
+            except queue.Empty:
+                if cancel.is_set():
+                    break
+                continue
+            if entry is None:
+                fed = True
+                continue
+            if cancel.is_set():
+                break
+            site, future = entry
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                stats.failed += 1
+                if on_error:
+                    on_error(site, e)
+                else:
+                    log_error(f"Thread failed on {site}: {e}")
+                if progress:
+                    progress(stats)
+                continue
+            stats.completed += 1
+            if progress:
+                progress(stats)
+            yield result
+        drained = not cancel.is_set()
+    finally:
+        if drained:  # every site finished: leave the caller's Event as it was
+            DRIVERS.release(cancel)
+        else:  # cancelled, closed early or failed: stop what is still in flight
+            DRIVERS.cancel(cancel)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ==============================
+# Cross-site Deduplication
+# ==============================
+def canonicalize_url(url: str) -> str:
+    """https://www.Example.com/ , http://example.com -> https://example.com"""
+    url = url.strip()
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parsed.path.rstrip("/")
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"https://{host}{path}{query}"
+
+
+def site_key(url: str) -> str:
+    """Entity key of a site: its root domain, or the full URL on shared hosts"""
+    root = get_root_domain(url)
+    if root in SHARED_HOSTS:
+        return canonicalize_url(url)
+    return root
+
+
+def resolve_redirect(url: str, timeout: int = 5) -> str:
+    """Final URL after redirects, or url itself if the site doesn't answer"""
+    try:
+        res = requests.head(
+            url, headers=HEADERS, timeout=timeout, allow_redirects=True, verify=False
+        )
+        return res.url or url
+    except requests.RequestException:
+        return url
+
+
+def dedupe_sites(
+    urls: List[str], resolve_redirects: bool = False, max_workers: int = 12
+) -> Tuple[List[str], int]:
+    """
+    Drop URLs pointing at an already listed entity (www vs bare, http vs https,
+    redirects when resolve_redirects is set). Returns (unique_urls, scrapes_saved).
+    """
+    urls = [u.strip() for u in urls if u and u.strip()]
+    targets = urls
+    if resolve_redirects:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            targets = list(executor.map(resolve_redirect, urls))
+    deduper = SiteDeduper()
+    unique = [url for url, target in zip(urls, targets) if deduper.admit(url, target)]
+    return unique, deduper.saved
+
+
+class SiteDeduper:
+    """Incremental dedupe_sites for URLs that arrive one at a time (Maps stream)."""
+
+    def __init__(self, resolve_redirects: bool = False):
+        self.resolve_redirects = resolve_redirects
+        self.seen: Set[str] = set()
+        self.admitted = 0
+        self.saved = 0
+
+    def admit(self, url: str, target: Optional[str] = None) -> bool:
+        """True if url is a new entity and should be scraped."""
+        url = url.strip()
+        if not url:
+            return False
+        if target is None:
+            target = resolve_redirect(url) if self.resolve_redirects else url
+        keys = {site_key(url), site_key(target)}
+        if keys & self.seen:
+            self.saved += 1
+            return False
+        self.seen.update(keys)
+        self.admitted += 1
+        return True
+
+
+class ResultIndex:
+    """Merges scrape results that belong to the same entity (see site_key)."""
+
+    def __init__(self):
+        self.rows: Dict[str, Dict] = {}
+        self.merged = 0
+
+    @staticmethod
+    def _values(field) -> List[str]:
+        return field if isinstance(field, list) else []
+
+    def add(self, result: Dict):
+        if result["website"]:
+            key = site_key(result["website"])
+        else:  # Maps listing without a website
+            key = f"listing:{result.get('name', '')}|{result.get('address', '')}"
+        row = self.rows.get(key)
+        if row is None:
+            self.rows[key] = dict(result)
+            return
+        self.merged += 1
+        for field in ("emails", "numbers"):
+            values = sorted(set(self._values(row[field])) | set(self._values(result[field])))
+            row[field] = values or row[field]
+        if result.get("sources"):
+            sources = row.setdefault("sources", {})
+            for field, found in result["sources"].items():
+                sources[field] = {**found, **sources.get(field, {})}
+
+    def results(self) -> List[Dict]:
+        return list(self.rows.values())
+
+
+def merge_results(results: List[Dict]) -> List[Dict]:
+    """One row per entity; logs how many duplicate rows were folded in."""
+    index = ResultIndex()
+    for result in results:
+        index.add(result)
+    if index.merged:
+        log_info(f"Merged {index.merged} duplicate results by domain")
+    return index.results()
+
+
+# ==============================
+# Result Cache
+# ==============================
+class ResultCache:
+    """
+    Site results in a SQLite file keyed by site_key (the root domain for most
+    sites), with the page each contact was found on and when it was scraped.
+    Campaigns that hit the same businesses again only scrape stale or new sites.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            website TEXT NOT NULL,
+            result TEXT NOT NULL,
+            sources TEXT NOT NULL,
+            scraped REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, ttl_days: float = CACHE_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        {"result", "pages", "scraped", "fresh"} for url's site, or None.
+        "pages" are the pages its contacts came from, for revalidation.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result, sources, scraped FROM results WHERE key = ?", (site_key(url),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            fresh = time.time() - row[2] < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        sources = json.loads(row[1])
+        pages = {
+            page
+            for field in ("emails", "phones")
+            for page in sources.get(field, {}).values()
+            if page.startswith(("http://", "https://"))
+        }
+        return {
+            "result": json.loads(row[0]),
+            "sources": sources,
+            "pages": sorted(pages),
+            "scraped": row[2],
+            "fresh": fresh,
+        }
+
+    def put(self, url: str, result: Dict, emails: Dict[str, str], phones: Dict[str, str]):
+        sources = json.dumps({"emails": emails, "phones": phones}, ensure_ascii=False)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, website, result, sources, scraped)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (site_key(url), url, json.dumps(result, ensure_ascii=False), sources, time.time()),
+            )
+            self.conn.commit()
+
+    def summary(self) -> str:
+        return f"Result cache: {self.hits} fresh hits, {self.misses} scraped or revalidated"
+
+
+# ==============================
+# Email Verification
+# ==============================
+def _address_status(domain: str) -> Optional[bool]:
+    try:
+        socket.getaddrinfo(domain, None)
+        return True
+    except socket.gaierror as e:
+        if e.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)):
+            return False
+        return None
+
+
+def _resolve_address(domain: str) -> Optional[bool]:
+    """
+    _address_status() bounded by MX_TIMEOUT: getaddrinfo() has no timeout of
+    its own, so it runs in a daemon thread and a late answer counts as None.
+    """
+    answer = []
+    lookup = threading.Thread(target=lambda: answer.append(_address_status(domain)), daemon=True)
+    lookup.start()
+    lookup.join(MX_TIMEOUT)
+    return answer[0] if answer else None
+
+
+def resolve_mx(domain: str) -> Optional[bool]:
+    """
+    True when domain can receive mail (MX records, or an address record as
+    the implicit MX), False when it doesn't exist or has a null MX, None when
+    the lookup failed. MX records need the optional dnspython package;
+    without it only the address lookup is made.
+    """
+    try:
+        import dns.exception
+        import dns.resolver
+    except ImportError:
+        return _resolve_address(domain)
+    try:
+        answer = dns.resolver.resolve(domain, "MX", lifetime=MX_TIMEOUT)
+        return any(str(record.exchange) != "." for record in answer)  # "0 ." is a null MX
+    except dns.resolver.NXDOMAIN:
+        return False
+    except dns.resolver.NoAnswer:
+        return _resolve_address(domain)
+    except dns.exception.DNSException:
+        return None
+
+
+class EmailValidator:
+    """
+    Post-extraction check of email addresses: "invalid" for impossible ones
+    (file-extension TLDs) and domains that can't receive mail, "valid" when
+    the domain has a mail host, "unknown" when DNS didn't answer. Lookups are
+    made once per domain, MX_WORKERS at a time, and shared by every batch
+    through a cache (MX_NEGATIVE_TTL for negative answers; unknowns are
+    looked up again). resolve(domain) -> True/False/None can be swapped for
+    a stub.
+    """
+
+    STATUS = {True: "valid", False: "invalid", None: "unknown"}
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Optional[bool]] = resolve_mx,
+        workers: int = MX_WORKERS,
+    ):
+        self.resolve = resolve
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mx")
+        self.lock = threading.Lock()
+        self.cache: Dict[str, Tuple[str, float]] = {}  # domain -> (status, expires)
+        self.pending: Dict[str, Future] = {}  # lookups in flight, shared by callers
+        self.lookups = 0
+        self.cached = 0
+        self.counts = {status: 0 for status in self.STATUS.values()}
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def domain(email: str) -> Optional[str]:
+        """The email's domain, or None when it can't be a real address."""
+        local, _, domain = email.rpartition("@")
+        tld = domain.rsplit(".", 1)[-1]
+        idn = tld.startswith("xn--") and tld[4:].replace("-", "").isalnum()  # punycode, e.g. xn--p1ai
+        if not local or "." not in domain or not (tld.isalpha() or idn) or tld in FILE_EXTENSIONS:
+            return None
+        return domain
+
+    def _lookup(self, domain: str) -> Future:
+        with self.lock:
+            hit = self.cache.get(domain)
+            if hit and hit[1] > time.monotonic():
+                self.cached += 1
+                future = Future()
+                future.set_result(hit[0])
+                return future
+            future = self.pending.get(domain)
+            if future is None:
+                self.lookups += 1
+                future = self.pending[domain] = self.pool.submit(self._resolve, domain)
+            return future
+
+    def _resolve(self, domain: str) -> str:
+        try:
+            found = self.resolve(domain)
+        except Exception as e:
+            log_debug(f"MX lookup of {domain} failed: {e}")
+            found = None
+        status = self.STATUS[found]
+        with self.lock:
+            if found is not None:
+                ttl = MX_CACHE_TTL if found else MX_NEGATIVE_TTL
+                self.cache[domain] = (status, time.monotonic() + ttl)
+            self.pending.pop(domain, None)
+        return status
+
+    def validate(self, emails: Iterable[str]) -> Dict[str, str]:
+        """{email: status} with one lookup per distinct domain."""
+        statuses = {}
+        futures = {}
+        for email in emails:
+            domain = self.domain(email)
+            if domain is None:
+                statuses[email] = "invalid"
+            else:
+                futures[email] = self._lookup(domain)
+        for email, future in futures.items():
+            statuses[email] = future.result()
+        with self.lock:
+            for status in statuses.values():
+                self.counts[status] += 1
+        return statuses
+
+    def summary(self) -> str:
+        with self.lock:
+            counts = ", ".join(f"{n} {status}" for status, n in self.counts.items())
+            return f"Emails: {counts} ({self.lookups} domains looked up, {self.cached} cached)"
+
+
+def validate_results(rows: List[Dict], validator: EmailValidator) -> List[Dict]:
+    """Add "email_status" ({email: valid/invalid/unknown}) to every row, in one batch."""
+    emails = {email for row in rows for email in _as_list(row.get("emails"))}
+    statuses = validator.validate(emails)
+    return [
+        dict(row, email_status={e: statuses[e] for e in _as_list(row.get("emails"))})
+        for row in rows
+    ]
+
+
+# ==============================
+# Output Sinks
+# ==============================
+def _as_list(value) -> List[str]:
+    """emails/numbers as a real list ("Not found" / "Error" become [])"""
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+def _provenance(sources: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
+    """{"emails": {value: page}, ...} -> [{"field", "value", "page"}, ...]"""
+    return [
+        {"field": field, "value": value, "page": page}
+        for field, found in sources.items()
+        for value, page in found.items()
+    ]
+
+
+class JsonlSink:
+    """One compact JSON object per line; gzip-compressed when the path ends in .gz."""
+
+    def __init__(self, path: str):
+        self.path = path
+        opener = gzip.open if path.endswith(".gz") else open
+        self.f = opener(path, "wt", encoding="utf-8")
+
+    def write(self, row: Dict):
+        row = dict(row, emails=_as_list(row.get("emails")), numbers=_as_list(row.get("numbers")))
+        self.f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.f.close()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ParquetSink:
+    """
+    Parquet file with emails/numbers as list<string> columns and provenance
+    as list<struct<field, value, page>>, email_status as list<struct<email,
+    status>>. Needs the optional pyarrow package.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow") from None
+        self.pa = pa
+        self.path = path
+        self.rows: List[Dict] = []
+        self.schema = pa.schema(
+            [
+                ("website", pa.string()),
+                ("name", pa.string()),
+                ("address", pa.string()),
+                ("emails", pa.list_(pa.string())),
+                ("numbers", pa.list_(pa.string())),
+                (
+                    "sources",
+                    pa.list_(
+                        pa.struct(
+                            [("field", pa.string()), ("value", pa.string()), ("page", pa.string())]
+                        )
+                    ),
+                ),
+                (
+                    "email_status",
+                    pa.list_(pa.struct([("email", pa.string()), ("status", pa.string())])),
+                ),
+            ]
+        )
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, row: Dict):
+        self.rows.append(
+            {
+                "website": row.get("website"),
+                "name": row.get("name"),
+                "address": row.get("address"),
+                "emails": _as_list(row.get("emails")),
+                "numbers": _as_list(row.get("numbers")),
+                "sources": _provenance(row["sources"]) if row.get("sources") else None,
+                "email_status": [
+                    {"email": email, "status": status}
+                    for email, status in row.get("email_status", {}).items()
+                ]
+                or None,
+            }
+        )
+        if len(self.rows) >= PARQUET_ROW_GROUP:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            table = self.pa.Table.from_pylist(self.rows, schema=self.schema)
+            self.writer.write_table(table)
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_sink(path: str):
+    """JsonlSink or ParquetSink, picked by the file extension"""
+    if path.endswith(".parquet"):
+        return ParquetSink(path)
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        return JsonlSink(path)
+    raise ValueError(f"Unsupported output file: {path}")
+
+
+def _csv_value(value):
+    if isinstance(value, dict):
+        return "; ".join(f"{k}: {v}" for k, v in value.items())
+    if isinstance(value, list):
+        return "; ".join(value)
+    return value
+
+
+def write_csv(data: List[Dict], path: str):
+    """CSV with list fields joined by "; " (dicts as "key: value") instead of Python reprs"""
+    fields: List[str] = []
+    for row in data:
+        fields.extend(k for k in row if k not in fields and k != "sources")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fields, extrasaction="ignore")
+        w.writeheader()
+        for row in data:
+            w.writerow({k: _csv_value(v) for k, v in row.items()})
 
 
 # ==============================
 # CLI & Main Runner
 # ==============================
-def save_results(data: List[Dict], filename: str):
-    dirs_to_create = ["json_data", "csv_data"]
-    for folder in dirs_to_create:
-        if not os.path.exists(folder):
-            os.makedirs(folder)
+def make_extractor(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool for the parsing stage; None keeps parsing in the I/O threads"""
+    if workers and workers > 0:
+        return ProcessPoolExecutor(max_workers=workers)
+    return None
+
+
+def save_results(data: List[Dict], filename: str, fmt: str = "json"):
+    """
+    Save under ./json_data (+ ./csv_data for "json"); "jsonl", "jsonl.gz" and
+    "parquet" stream rows through the matching sink instead.
+    """
+    if not os.path.exists("json_data"):
+        os.makedirs("json_data")
     try:
+        if fmt != "json":
+            path = os.path.join("json_data", f"{filename}.{fmt}")
+            sink = open_sink(path)
+            try:
+                for row in data:
+                    sink.write(row)
+            finally:
+                sink.close()
+            log_info(f"Results saved to ./{path}")
+            return
         with open(
             os.path.join("json_data", f"{filename}.json"), "w", encoding="utf-8"
         ) as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         log_info(f"Results saved to ./json_data/{filename}.json")
-        with open(
-            os.path.join("csv_data", f"{filename}.csv"), "w", encoding="utf-8"
-        ) as f:
-            if len(data) > 0:
-                w = csv.DictWriter(f, data[0].keys())
-                w.writeheader()
-                for row in data:
-                    w.writerow(row)
-                log_info(f"Results saved to ./csv_data/{filename}.csv")
+        if len(data) > 0:
+            if not os.path.exists("csv_data"):
+                os.makedirs("csv_data")
+            write_csv(data, os.path.join("csv_data", f"{filename}.csv"))
+            log_info(f"Results saved to ./csv_data/{filename}.csv")
     except Exception as e:
         log_error(f"Failed to save file: {e}")
 
@@ -746,6 +3122,12 @@ def main():
         "--file",
         help="Scrapes websites in the file containing URLs in each new line",
     )
+    group.add_argument(
+        "-q",
+        "--queries",
+        help="File with one Google Maps query per line, collected concurrently\n"
+        "(-n applies per query)",
+    )
     parser.add_argument(
         "-n",
         "--number",
@@ -756,77 +3138,245 @@ def main():
     parser.add_argument(
         "-l", "--log", action="store_true", help="Save output to JSON file"
     )
+    parser.add_argument(
+        "-r",
+        "--resolve-redirects",
+        action="store_true",
+        help="Follow redirects before scraping to skip sites that point to the same domain",
+    )
+    parser.add_argument(
+        "-p",
+        "--parse-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to parse pages in batch runs, 0 parses in the I/O threads\n"
+        "(default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-b",
+        "--browsers",
+        type=int,
+        default=MAPS_BROWSERS,
+        help=f"Firefox instances shared by -q queries (default: {MAPS_BROWSERS})",
+    )
+    parser.add_argument(
+        "-s",
+        "--skip-known",
+        action="store_true",
+        help="With -k/-q, don't crawl sites whose phone number is already shown on Maps",
+    )
+    parser.add_argument(
+        "-c",
+        "--cache",
+        help="SQLite file of past results; sites scraped within --cache-ttl are not scraped again",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=CACHE_TTL_DAYS,
+        help=f"Days a cached result stays fresh (default: {CACHE_TTL_DAYS:g})",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="For stale cached sites, refetch only the pages the contacts were found on",
+    )
+    parser.add_argument(
+        "-o",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output format with -l: json (+csv), jsonl, jsonl.gz or parquet (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRY_ATTEMPTS,
+        help=f"Tries per request on resets, timeouts, 429 and 5xx (default: {RETRY_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Fetch over HTTP/2 with httpx (pip install 'httpx[http2]')",
+    )
+    parser.add_argument(
+        "-P",
+        "--profile",
+        default=DEFAULT_PROFILE,
+        help=f"Crawl profile: {', '.join(CRAWL_PROFILES)} or a JSON file\n"
+        f"(default: {DEFAULT_PROFILE})",
+    )
+    parser.add_argument(
+        "--ignore-robots",
+        action="store_true",
+        help="Don't read robots.txt (disallowed paths and Crawl-delay are obeyed by default)",
+    )
+    parser.add_argument(
+        "--path-stats",
+        help="SQLite file of path hit rates learned over past runs, used to order and\n"
+        "prune probes (default: the -c cache file)",
+    )
+    parser.add_argument(
+        "--verify-emails",
+        action="store_true",
+        help="Mark each email valid/invalid/unknown by its domain's MX records\n"
+        "(MX needs dnspython; without it the domain's address is looked up)",
+    )
+    parser.add_argument(
+        "--provenance",
+        action="store_true",
+        help="Record the page each email/phone was found on",
+    )
     args = parser.parse_args()
+    if args.format == "parquet" and not parquet_available():
+        # fail before scraping, not when the results are saved
+        parser.error("--format parquet needs pyarrow: pip install pyarrow")
     results = []
-    if args.url:
-        scraper = ContactScraper(args.url)
-        result = scraper.run()
-        results.append(result)
-        pprint(result)
-    elif args.keywords:
-        maps = MapsScraper(args.keywords, limit=args.number)
-        websites = maps.run()
-        if not websites:
-            log_error("No websites found.")
-            return
-        results = []
-        MAX_WORKERS = 13  # Tune: 5–15 safe for most home IPs
+    stats = ScrapeStats()
+    cancel = threading.Event()  # set on Ctrl+C, so browsers and fetches stop too
+    RETRY_POLICY.attempts = max(args.retries, 1)
+    try:
+        profile = load_profile(args.profile)
+    except (OSError, ValueError) as e:
+        parser.error(f"--profile: {e}")
+    cache = ResultCache(args.cache, args.cache_ttl) if args.cache else None
+    if args.path_stats or args.cache:
+        PATH_STATS.open(args.path_stats or args.cache)
+    ROBOTS.enabled = not args.ignore_robots
+    if args.cache and ROBOTS.enabled:
+        ROBOTS.open(args.cache)
+    transport = HTTP_TRANSPORT
+    if args.http2:
+        if http2_available():
+            transport = "http2"
+        else:
+            log_error("httpx[http2] is not installed, using requests (HTTP/1.1)")
 
-        def subscraper(site: str):
-            try:
-                scraper = ContactScraper(site)
-                result = scraper.run()
-                results.append(result)
+    validator = EmailValidator() if args.verify_emails else None
+
+    def verify(rows: List[Dict]) -> List[Dict]:
+        return validate_results(rows, validator) if validator and rows else rows
+
+    def collect(items: Iterable, concurrency: int, extractor=None, deduper=None) -> List[Dict]:
+        rows = []
+        try:
+            for result in scrape_many(
+                items,
+                concurrency=concurrency,
+                extractor=extractor,
+                deduper=deduper,
+                skip_known=args.skip_known,
+                cancel=cancel,
+                stats=stats,
+                cache=cache,
+                revalidate=args.revalidate,
+                provenance=args.provenance,
+                transport=transport,
+                profile=profile,
+            ):
+                rows.append(result)
                 pprint(result)
-                # time.sleep(0.8) # Be nice to servers
-            except Exception as e:
-                log_error(f"Thread failed on {site}: {e}")
-
-        # THREAD POOL (fast, clean, auto-join)
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            executor.map(subscraper, websites)
-        # SAVE AFTER ALL DONE
-        if args.log and results:
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-            safe_kw = re.sub(r"[^\w\-_]", "_", args.keywords)
-            filename = f"contacts_[{safe_kw}]_{timestamp}.json"
-            save_results(results, filename)
-    elif args.file:
-        maps = MapsScraper("", inpfile=args.file)
-        websites = maps.websites
-        if not websites:
-            log_error("No websites found.")
-            return
-        results = []
-        MAX_WORKERS = 12  # Tune: 5–15 safe for most home IPs
+        except KeyboardInterrupt:
+            # stop fetches and browsers, then save what was scraped so far
+            log_error("Interrupted, stopping the batch")
+            DRIVERS.cancel(cancel)
+        return rows
 
-        def subscraper(site: str):
-            site = site.strip()
-            try:
-                if site:
-                    scraper = ContactScraper(site)
-                    result = scraper.run()
-                    results.append(result)
-                    pprint(result)
-                # time.sleep(0.8) # Be nice to servers
-            except Exception as e:
-                log_error(f"Thread failed on {site}: {e}")
-
-        # THREAD POOL (fast, clean, auto-join)
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            executor.map(subscraper, websites)
-        # SAVE AFTER ALL DONE
-        if args.log and results:
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
-            safe_kw = re.sub(r"[^\w\-_]", "_", args.file)
-            filename = f"contacts_[{safe_kw}]_{timestamp}.json"
-            save_results(results, filename)
-
-    if args.log and results and args.url:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        keyword_part = args.keywords.replace(" ", "_") if args.keywords else "single"
-        filename = f"contacts_[{keyword_part}]_{timestamp}"
-        save_results(results, filename)
+    try:
+        if args.url:
+            results = verify(collect([args.url], 1))
+        elif args.keywords:
+            maps = MapsScraper(args.keywords, limit=args.number, cancel=cancel)
+            extractor = make_extractor(args.parse_workers)
+            # Sites are scraped as Maps finds them, so scrolling and scraping overlap
+            results = collect(
+                maps.stream_listings(include_no_website=True),
+                13,
+                extractor,
+                SiteDeduper(args.resolve_redirects),
+            )
+            if extractor:
+                extractor.shutdown()
+            if not results:
+                log_error("No websites found.")
+                return
+            results = verify(merge_results(results))
+            # SAVE AFTER ALL DONE
+            if args.log and results:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+                safe_kw = re.sub(r"[^\w\-_]", "_", args.keywords)
+                filename = f"contacts_[{safe_kw}]_{timestamp}"
+                save_results(results, filename, args.format)
+        elif args.file:
+            maps = MapsScraper("", inpfile=args.file)
+            websites = maps.websites
+            if not websites:
+                log_error("No websites found.")
+                return
+            websites, saved = dedupe_sites(websites, args.resolve_redirects)
+            log_info(f"{len(websites)} unique sites ({saved} duplicate scrapes saved)")
+            MAX_WORKERS = 12  # Tune: 5–15 safe for most home IPs
+            extractor = make_extractor(args.parse_workers)
+            results = collect(websites, MAX_WORKERS, extractor)
+            if extractor:
+                extractor.shutdown()
+            results = verify(merge_results(results))
+            # SAVE AFTER ALL DONE
+            if args.log and results:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+                safe_kw = re.sub(r"[^\w\-_]", "_", args.file)
+                filename = f"contacts_[{safe_kw}]_{timestamp}"
+                save_results(results, filename, args.format)
+
+        elif args.queries:
+            with open(args.queries, "r", encoding="utf-8") as f:
+                queries = [line.strip() for line in f if line.strip()]
+            extractor = make_extractor(args.parse_workers)
+            results = collect(
+                stream_maps_batch(
+                    queries, args.number, args.browsers, include_no_website=True, cancel=cancel
+                ),
+                13,
+                extractor,
+            )
+            if extractor:
+                extractor.shutdown()
+            if not results:
+                log_error("No websites found.")
+                return
+            results = verify(merge_results(results))
+            if args.log and results:
+                timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+                safe_name = re.sub(r"[^\w\-_]", "_", args.queries)
+                filename = f"contacts_[{safe_name}]_{timestamp}"
+                save_results(results, filename, args.format)
+
+        if args.log and results and args.url:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            keyword_part = args.keywords.replace(" ", "_") if args.keywords else "single"
+            filename = f"contacts_[{keyword_part}]_{timestamp}"
+            save_results(results, filename, args.format)
+    finally:
+        if stats.submitted:
+            log_info(stats.summary())
+        if cache:
+            log_info(cache.summary())
+            cache.close()
+        if validator:
+            log_info(validator.summary())
+            validator.close()
+        if SPA_STATS.sites:
+            log_info(SPA_STATS.summary())
+        if PATH_STATS.tries:
+            log_info(PATH_STATS.summary())
+        PATH_STATS.close()
+        if ROBOTS.fetched or ROBOTS.cached:
+            log_info(ROBOTS.summary())
+        ROBOTS.close()
+        if FETCH_STATS.requests:
+            log_info(FETCH_STATS.summary())
+            if BREAKER.open_hosts():
+                log_info(f"{BREAKER.open_hosts()} hosts left with an open circuit")
 
 
 if __name__ == "__main__":
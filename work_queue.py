@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Distributed Contact Scraper – coordinator / worker mode
+A coordinator puts the site list into a shared SQLite queue; workers on any
+node lease sites from it, run ContactScraper and push results back.
+Leases expire, so sites held by a dead worker are handed to someone else.
+
+    python3 work_queue.py coordinator -f urls.txt --db queue.sqlite -l
+    python3 work_queue.py worker --db queue.sqlite -c 12
+
+Each coordinator run queues its sites under a run id, so a reused queue file
+scrapes them again and only returns this run's results.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scraper_v3 import (
+    CRAWL_PROFILES,
+    DEFAULT_PROFILE,
+    HTTP_TRANSPORT,
+    ContactScraper,
+    MapsScraper,
+    dedupe_sites,
+    http2_available,
+    load_profile,
+    log_error,
+    log_info,
+    make_extractor,
+    merge_results,
+    save_results,
+    site_key,
+)
+
+LEASE_SECONDS = 300  # a site's lease; renewed while the worker is still on it
+MAX_ATTEMPTS = 3  # leases handed out before a site is marked failed
+
+
+# ==============================
+# SQLite Work Queue
+# ==============================
+class WorkQueue:
+    """
+    Site queue in a SQLite file shared by the coordinator and all workers.
+    Each row is one site of one run (keyed by site_key, so an entity is only
+    queued once per run) moving pending -> leased -> done / failed. The file
+    uses the rollback journal: WAL needs shared memory, which network
+    filesystems don't provide.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sites (
+            id INTEGER PRIMARY KEY,
+            run TEXT NOT NULL,
+            key TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            lease_expires REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            result TEXT,
+            updated REAL,
+            UNIQUE (run, key)
+        );
+        CREATE INDEX IF NOT EXISTS sites_status ON sites (status, lease_expires);
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sites)")}
+        if "run" not in columns:
+            self.conn.close()
+            raise RuntimeError(f"{path} is a queue from an older version; use a new --db file")
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, urls: Iterable[str], run: str) -> int:
+        """Add sites to run; returns how many were new (a resumed run keeps its done sites)."""
+        now = time.time()
+        rows = [(run, site_key(url), url.strip(), now) for url in urls if url.strip()]
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO sites (run, key, url, updated) VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.execute("COMMIT")
+            return self.conn.total_changes - before
+
+    def lease(self, worker: str, n: int = 1) -> List[Tuple[int, str]]:
+        """Atomically take up to n pending (or expired) sites of any run: (id, url)."""
+        if n <= 0:
+            return []
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # leases that ran out of attempts are given up on
+                self.conn.execute(
+                    "UPDATE sites SET status = 'failed', error = 'lease expired', updated = ?"
+                    " WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                rows = self.conn.execute(
+                    "SELECT id, url FROM sites WHERE status = 'pending'"
+                    " OR (status = 'leased' AND lease_expires < ?) ORDER BY id LIMIT ?",
+                    (now, n),
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE sites SET status = 'leased', worker = ?, lease_expires = ?,"
+                    " attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(worker, now + self.lease_seconds, now, site) for site, _ in rows],
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def renew(self, sites: Iterable[int], worker: str):
+        """Extend the leases worker still holds."""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE sites SET lease_expires = ?, updated = ?"
+                " WHERE id = ? AND worker = ? AND status = 'leased'",
+                [(now + self.lease_seconds, now, site, worker) for site in sites],
+            )
+
+    def complete(self, site: int, worker: str, result: Dict):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE sites SET status = 'done', worker = ?, result = ?, error = NULL,"
+                " updated = ? WHERE id = ? AND status != 'done'",
+                (worker, json.dumps(result, ensure_ascii=False), time.time(), site),
+            )
+
+    def fail(self, site: int, worker: str, error: str):
+        """Give the site back to the queue, or mark it failed after MAX_ATTEMPTS."""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE sites SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+                " error = ?, updated = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error, time.time(), site, worker),
+            )
+
+    def stats(self, run: Optional[str] = None) -> Dict[str, int]:
+        """Sites per status, of one run or (for workers) all of them."""
+        where, params = ("WHERE run = ?", (run,)) if run is not None else ("", ())
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT status, COUNT(*) FROM sites {where} GROUP BY status", params
+            ).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def finished(self, run: Optional[str] = None) -> bool:
+        counts = self.stats(run)
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+    def results(self, run: str) -> List[Dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT result FROM sites WHERE run = ? AND status = 'done' ORDER BY id", (run,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def failures(self, run: str) -> List[Tuple[str, Optional[str]]]:
+        with self.lock:
+            return self.conn.execute(
+                "SELECT url, error FROM sites WHERE run = ? AND status = 'failed' ORDER BY id",
+                (run,),
+            ).fetchall()
+
+
+# ==============================
+# Coordinator & Worker
+# ==============================
+def run_coordinator(
+    queue: WorkQueue,
+    urls: List[str],
+    run: str,
+    resolve_redirects: bool = False,
+    poll: float = 5.0,
+) -> List[Dict]:
+    """Queue the sites as run, wait for the workers and return one merged row per entity."""
+    urls, saved = dedupe_sites(urls, resolve_redirects)
+    added = queue.enqueue(urls, run)
+    log_info(f"Queued {added} sites as run {run} ({saved} duplicate scrapes saved)")
+    while not queue.finished(run):
+        counts = queue.stats(run)
+        log_info(
+            f"pending={counts['pending']} leased={counts['leased']} "
+            f"done={counts['done']} failed={counts['failed']}"
+        )
+        time.sleep(poll)
+    for url, error in queue.failures(run):
+        log_error(f"{url} failed: {error}")
+    return merge_results(queue.results(run))
+
+
+def run_worker(
+    queue: WorkQueue,
+    worker: str,
+    concurrency: int = 12,
+    parse_workers: int = 0,
+    poll: float = 2.0,
+    wait_for_work: bool = False,
+    transport: Optional[str] = None,
+    profile: Optional[Dict] = None,
+):
+    """
+    Lease sites up to `concurrency` at a time and scrape them until the queue
+    is drained (or forever with wait_for_work). Leases of in-flight sites are
+    renewed on every loop, well within lease_seconds.
+    """
+    extractor = make_extractor(parse_workers)
+    in_flight = {}  # future -> site id
+    heartbeat = min(poll, queue.lease_seconds / 3)
+    scraped = 0
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                for site, url in queue.lease(worker, concurrency - len(in_flight)):
+                    scraper = ContactScraper(
+                        url, extractor=extractor, profile=profile, transport=transport
+                    )
+                    in_flight[pool.submit(scraper.run)] = site
+
+                if not in_flight:
+                    if not wait_for_work and queue.finished():
+                        break
+                    time.sleep(poll)
+                    continue
+
+                done, _ = wait(in_flight, timeout=heartbeat, return_when=FIRST_COMPLETED)
+                for future in done:
+                    site = in_flight.pop(future)
+                    try:
+                        queue.complete(site, worker, future.result())
+                        scraped += 1
+                    except Exception as e:
+                        log_error(f"Worker {worker} failed on site {site}: {e}")
+                        queue.fail(site, worker, str(e))
+                queue.renew(in_flight.values(), worker)
+    finally:
+        if extractor:
+            extractor.shutdown()
+    elapsed = time.perf_counter() - started
+    log_info(f"Worker {worker} scraped {scraped} sites in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Distributed contact scraping over a shared SQLite queue",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="Queue sites and collect results")
+    group = coord.add_mutually_exclusive_group(required=True)
+    group.add_argument("-k", "--keywords", help="Keywords to search in Google Maps")
+    group.add_argument("-f", "--file", help="File containing URLs in each new line")
+    coord.add_argument(
+        "-n", "--number", type=int, default=4, help="Number of Maps sites (default: 4)"
+    )
+    coord.add_argument("-l", "--log", action="store_true", help="Save output to JSON file")
+    coord.add_argument(
+        "-r", "--resolve-redirects", action="store_true", help="Follow redirects before queueing"
+    )
+    coord.add_argument(
+        "--run",
+        help="Run id; reuse one to resume a run after a crash (default: a new timestamp)",
+    )
+
+    worker = sub.add_parser("worker", help="Scrape sites leased from the queue")
+    worker.add_argument(
+        "-c", "--concurrency", type=int, default=12, help="Sites scraped at once (default: 12)"
+    )
+    worker.add_argument(
+        "-p",
+        "--parse-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to parse pages, 0 parses in the I/O threads",
+    )
+    worker.add_argument("--id", help="Worker id (default: <hostname>-<pid>)")
+    worker.add_argument(
+        "--wait", action="store_true", help="Keep polling for work when the queue is empty"
+    )
+    worker.add_argument(
+        "--http2", action="store_true", help="Fetch over HTTP/2 (pip install 'httpx[http2]')"
+    )
+    worker.add_argument(
+        "-P",
+        "--profile",
+        default=DEFAULT_PROFILE,
+        help=f"Crawl profile: {', '.join(CRAWL_PROFILES)} or a JSON file\n"
+        f"(default: {DEFAULT_PROFILE})",
+    )
+
+    for p in (coord, worker):
+        p.add_argument(
+            "--db",
+            default="queue.sqlite",
+            help="Shared queue file; a network share must support file locks\n"
+            "(default: queue.sqlite)",
+        )
+        p.add_argument(
+            "--lease",
+            type=float,
+            default=LEASE_SECONDS,
+            help=f"Lease timeout in seconds (default: {LEASE_SECONDS})",
+        )
+
+    args = parser.parse_args()
+    if args.role == "worker":
+        try:
+            profile = load_profile(args.profile)
+        except (OSError, ValueError) as e:
+            parser.error(f"--profile: {e}")
+    queue = WorkQueue(args.db, lease_seconds=args.lease)
+    try:
+        if args.role == "worker":
+            worker_id = args.id or f"{socket.gethostname()}-{os.getpid()}"
+            transport = HTTP_TRANSPORT
+            if args.http2:
+                if http2_available():
+                    transport = "http2"
+                else:
+                    log_error("httpx[http2] is not installed, using requests (HTTP/1.1)")
+            run_worker(
+                queue,
+                worker_id,
+                concurrency=args.concurrency,
+                parse_workers=args.parse_workers,
+                wait_for_work=args.wait,
+                transport=transport,
+                profile=profile,
+            )
+            return
+
+        if args.keywords:
+            urls = MapsScraper(args.keywords, limit=args.number).run()
+            name = args.keywords
+        else:
+            urls = list(MapsScraper("", inpfile=args.file).websites)
+            name = args.file
+        if not urls:
+            log_error("No websites found.")
+            return
+        run = args.run or datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+        results = run_coordinator(queue, urls, run, args.resolve_redirects)
+        log_info(f"Collected {len(results)} results")
+        if args.log and results:
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
+            safe_name = re.sub(r"[^\w\-_]", "_", name)
+            save_results(results, f"contacts_[{safe_name}]_{timestamp}")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()